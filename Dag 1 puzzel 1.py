@@ -1,7 +1,15 @@
-def compute_password(lines):
-    pos = 50        # startpositie
-    count_zero = 0  # aantal keren dat de wijzer op 0 staat na een rotatie
+import mmap
+import os
+import tempfile
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optioneel; zonder numpy gebruiken we alleen de scalaire versie
+    np = None
+
 
+def iter_rotations(lines):
+    """Zet tekstregels om naar (richting, afstand)-paren; lege regels worden overgeslagen."""
     for line in lines:
         line = line.strip()
         if not line:
@@ -9,13 +17,42 @@ def compute_password(lines):
 
         direction = line[0]          # 'L' of 'R'
         distance = int(line[1:])     # rest is het getal
+        yield direction, distance
+
+
+def iter_rotations_mmap(filename):
+    """
+    Streamende invoer: memory-map het bestand en decodeer 'L'/'R' + cijfers
+    direct uit de bytes. Er staat nooit meer dan één regel tegelijk in het
+    geheugen, hoe groot het rotatielog ook is.
+    """
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # een leeg bestand kan niet gemapt worden
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for raw in iter(mm.readline, b""):
+                raw = raw.strip()
+                if not raw:
+                    continue
+                yield chr(raw[0]), int(raw[1:])
+
 
+def compute_password(lines):
+    return compute_password_stream(iter_rotations(lines))
+
+
+def compute_password_stream(rotations):
+    pos = 50        # startpositie
+    count_zero = 0  # aantal keren dat de wijzer op 0 staat na een rotatie
+
+    for direction, distance in rotations:
         if direction == 'R':
             pos = (pos + distance) % 100
         elif direction == 'L':
             pos = (pos - distance) % 100
         else:
-            raise ValueError(f"Onbekende richting in regel: {line}")
+            raise ValueError(f"Onbekende richting in regel: {direction}{distance}")
 
         if pos == 0:
             count_zero += 1
@@ -23,6 +60,116 @@ def compute_password(lines):
     return count_zero
 
 
+def parse_rotations(lines):
+    """
+    Batch-parser: zet alle rotaties in één keer om naar een int64-array met
+    getekende afstanden (R = positief, L = negatief). Vereist numpy.
+    """
+    return parse_rotations_bytes("\n".join(lines).encode("utf-8"))
+
+
+# ASCII-witruimte tussen de rotaties (zoals bytes.split die ook herkent)
+WHITESPACE_BYTES = b" \t\n\r\f\v"
+# Grootste aantal cijfers waarvan de waarde zeker in een int64 past
+MAX_DISTANCE_DIGITS = 18
+
+
+def parse_rotations_bytes(buf):
+    """
+    Zelfde uitkomst als parse_rotations, maar rechtstreeks op de ruwe bytes
+    (bytes of een mmap), zonder tussenliggende strings:
+      - richting en teken komen uit de posities van de 'L'/'R'-bytes
+      - de afstanden worden kolom voor kolom opgebouwd: in stap j schuift elke
+        rotatie waarvan byte j na de richting nog een cijfer is, dat cijfer in
+        (afstand * 10 + cijfer); het aantal stappen is het langste getal
+    Vereist numpy.
+    """
+    data = np.frombuffer(buf, dtype=np.uint8)
+    n = data.size
+
+    # Klassen per byte (uint8 rondt onder 0 af naar boven, dus één vergelijking)
+    is_digit = (data - ord("0")) < 10
+    is_dir = (data == ord("L")) | (data == ord("R"))
+    is_space = (data == ord(" ")) | ((data - ord("\t")) < 5)  # \t \n \v \f \r
+
+    # Elke rotatie is precies: witruimte, 'L'/'R', één of meer cijfers
+    dir_pos = np.flatnonzero(is_dir)
+    after = dir_pos + 1
+    valid = (
+        np.count_nonzero(is_digit) + dir_pos.size + np.count_nonzero(is_space) == n
+        and is_space[dir_pos[dir_pos > 0] - 1].all()
+        and (after < n).all()
+        and is_digit[after[after < n]].all()
+        and not (n and is_digit[0])
+        and not (is_digit[1:] & ~(is_digit[:-1] | is_dir[:-1])).any()
+    )
+    if not valid:
+        bad = _first_bad_byte(data, is_digit, is_dir, is_space)
+        raise ValueError(f"Onbekende richting in regel: {_token_at(buf, bad)}")
+
+    distances = np.zeros(dir_pos.size, dtype=np.int64)
+    active = np.ones(dir_pos.size, dtype=bool)
+    pos = dir_pos.copy()
+    for offset in range(MAX_DISTANCE_DIGITS + 1):
+        pos += 1
+        active &= pos < n
+        digit = data[np.minimum(pos, n - 1)] - ord("0")
+        active &= digit < 10
+        if not active.any():
+            break
+        if offset == MAX_DISTANCE_DIGITS:
+            raise ValueError("Afstand past niet in een int64.")
+        np.multiply(distances, 10, out=distances, where=active)
+        np.add(distances, digit, out=distances, where=active)
+
+    return np.where(data[dir_pos] == ord("L"), -distances, distances)
+
+
+def _first_bad_byte(data, is_digit, is_dir, is_space) -> int:
+    """Positie van de eerste byte die niet in 'witruimte, L/R, cijfers' past."""
+    space_before = np.concatenate(([True], is_space[:-1]))
+    dir_before = np.concatenate(([False], is_dir[:-1]))
+    digit_before = np.concatenate(([False], is_digit[:-1]))
+    digit_after = np.concatenate((is_digit[1:], [False]))
+
+    bad = ~(is_digit | is_dir | is_space)
+    bad |= is_dir & ~(space_before & digit_after)
+    bad |= is_digit & ~(digit_before | dir_before)
+    return int(np.argmax(bad))
+
+
+def _token_at(buf, pos: int) -> str:
+    """Het stuk tekst (tussen witruimte) rond byte pos, voor foutmeldingen."""
+    start = pos
+    while start > 0 and buf[start - 1] not in WHITESPACE_BYTES:
+        start -= 1
+    end = pos
+    while end < len(buf) and buf[end] not in WHITESPACE_BYTES:
+        end += 1
+    return bytes(buf[start:end]).decode("utf-8", "replace")
+
+def parse_rotations_mmap(filename):
+    """
+    parse_rotations_bytes rechtstreeks op het memory-mapped bestand: de
+    regels worden nooit als str ingelezen. Vereist numpy.
+    """
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return np.zeros(0, dtype=np.int64)  # een leeg bestand kan niet gemapt worden
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return parse_rotations_bytes(mm)
+
+
+def compute_password_numpy(signed):
+    """
+    Gevectoriseerde variant van compute_password: de eindposities volgen uit
+    een cumulatieve som modulo 100 over de getekende afstanden.
+    """
+    positions = (50 + np.cumsum(signed)) % 100
+    return int(np.count_nonzero(positions == 0))
+
+
 def test_example():
     example_lines = [
         "L68",
@@ -37,16 +184,37 @@ def test_example():
         "L82",
     ]
     assert compute_password(example_lines) == 3
+    if np is not None:
+        assert compute_password_numpy(parse_rotations(example_lines)) == 3
+        # Andere witruimte is geldig, een onbekende richting geeft een ValueError
+        assert list(parse_rotations(["L5\f", "R3\v"])) == [-5, 3]
+        assert parse_rotations_bytes(b"L68\r\nR48\n").tolist() == [-68, 48]
+
+        # Zelfde uitkomst direct uit een (gemapt) bestand
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "voorbeeld.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(example_lines) + "\n")
+            assert compute_password_numpy(parse_rotations_mmap(path)) == 3
+        try:
+            parse_rotations(["L5", "X3"])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Onbekende richting niet herkend")
     print("Voorbeeldtest geslaagd: wachtwoord = 3")
 
 
 def main():
     test_example()  # controleer eerst het voorbeeld
 
-    with open("input_puzzel_dag1.txt", "r", encoding="utf-8") as f:
-        lines = f.readlines()
+    filename = "input_puzzel_dag1.txt"
 
-    password = compute_password(lines)
+    if np is not None:
+        password = compute_password_numpy(parse_rotations_mmap(filename))
+    else:
+        # Zonder numpy streamen we de rotaties rechtstreeks uit het bestand
+        password = compute_password_stream(iter_rotations_mmap(filename))
     print("Het wachtwoord is:", password)
 
 
@@ -1,22 +1,60 @@
-def compute_password_end_only(lines):
-    """Oude methode: tel alleen keren dat de wijzer na een rotatie op 0 staat."""
-    pos = 50
-    count_zero = 0
+import mmap
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optioneel; zonder numpy gebruiken we alleen de scalaire versie
+    np = None
+
+
+def iter_rotations(lines):
+    """Zet tekstregels om naar (richting, afstand)-paren; lege regels worden overgeslagen."""
     for line in lines:
         line = line.strip()
         if not line:
             continue
+        yield line[0], int(line[1:])
+
+
+def iter_rotations_mmap(filename):
+    """
+    Streamende invoer: memory-map het bestand en decodeer 'L'/'R' + cijfers
+    direct uit de bytes. Er staat nooit meer dan één regel tegelijk in het
+    geheugen, hoe groot het rotatielog ook is.
+    """
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # een leeg bestand kan niet gemapt worden
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for raw in iter(mm.readline, b""):
+                raw = raw.strip()
+                if not raw:
+                    continue
+                yield chr(raw[0]), int(raw[1:])
+
+
+def compute_password_end_only(lines):
+    """Oude methode: tel alleen keren dat de wijzer na een rotatie op 0 staat."""
+    return compute_password_end_only_stream(iter_rotations(lines))
+
 
-        direction = line[0]
-        distance = int(line[1:])
+def compute_password_end_only_stream(rotations):
+    """Oude methode op een stroom (richting, afstand)-paren."""
+    pos = 50
+    count_zero = 0
 
+    for direction, distance in rotations:
         if direction == 'R':
             pos = (pos + distance) % 100
         elif direction == 'L':
             pos = (pos - distance) % 100
         else:
-            raise ValueError(f"Onbekende richting in regel: {line}")
+            raise ValueError(f"Onbekende richting in regel: {direction}{distance}")
 
         if pos == 0:
             count_zero += 1
@@ -24,15 +62,16 @@ def compute_password_end_only(lines):
     return count_zero
 
 
-def zeros_during_rotation(pos, direction, distance):
+def zeros_during_rotation(pos, direction, distance, modulus=100):
     """
     Nieuwe methode-hulpje:
     tel hoeveel keer de wijzer tijdens deze éne rotatie op 0 komt,
     inclusief eventueel op het einde van de rotatie.
+    De wijzerplaat heeft standaard 100 standen (0..99).
     """
     # Elke 100 klikken maak je een volledige ronde en kom je exact 1x langs 0.
-    full_cycles = distance // 100
-    rem = distance % 100
+    full_cycles = distance // modulus
+    rem = distance % modulus
 
     zeros = full_cycles
 
@@ -40,13 +79,13 @@ def zeros_during_rotation(pos, direction, distance):
     if direction == 'R':
         # Afstand tot de eerstvolgende 0 als je naar rechts draait.
         if pos == 0:
-            dist_to_zero = 100  # je moet een hele ronde maken voordat je weer 0 raakt
+            dist_to_zero = modulus  # je moet een hele ronde maken voordat je weer 0 raakt
         else:
-            dist_to_zero = 100 - pos
+            dist_to_zero = modulus - pos
     elif direction == 'L':
         # Afstand tot de eerstvolgende 0 als je naar links draait.
         if pos == 0:
-            dist_to_zero = 100
+            dist_to_zero = modulus
         else:
             dist_to_zero = pos
     else:
@@ -61,17 +100,15 @@ def zeros_during_rotation(pos, direction, distance):
 
 def compute_password_clicks(lines):
     """Nieuwe methode 0x434C49434B: tel elke klik waarop de wijzer op 0 staat."""
-    pos = 50
-    total_zeros = 0
+    return compute_password_clicks_stream(iter_rotations(lines))
 
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
 
-        direction = line[0]
-        distance = int(line[1:])
+def compute_password_clicks_stream(rotations):
+    """Nieuwe methode op een stroom (richting, afstand)-paren, bv. uit iter_rotations_mmap."""
+    pos = 50
+    total_zeros = 0
 
+    for direction, distance in rotations:
         # 1. Tel alle keren dat we tijdens deze rotatie op 0 terechtkomen.
         total_zeros += zeros_during_rotation(pos, direction, distance)
 
@@ -81,11 +118,285 @@ def compute_password_clicks(lines):
         elif direction == 'L':
             pos = (pos - distance) % 100
         else:
-            raise ValueError(f"Onbekende richting in regel: {line}")
+            raise ValueError(f"Onbekende richting in regel: {direction}{distance}")
+
+    return total_zeros
+
+
+def parse_rotations(lines):
+    """
+    Batch-parser: zet alle rotaties in één keer om naar een int64-array met
+    getekende afstanden (R = positief, L = negatief). Vereist numpy.
+    """
+    return parse_rotations_bytes("\n".join(lines).encode("utf-8"))
+
+
+# ASCII-witruimte tussen de rotaties (zoals bytes.split die ook herkent)
+WHITESPACE_BYTES = b" \t\n\r\f\v"
+# Grootste aantal cijfers waarvan de waarde zeker in een int64 past
+MAX_DISTANCE_DIGITS = 18
+
+
+def parse_rotations_bytes(buf):
+    """
+    Zelfde uitkomst als parse_rotations, maar rechtstreeks op de ruwe bytes
+    (bytes of een mmap), zonder tussenliggende strings:
+      - richting en teken komen uit de posities van de 'L'/'R'-bytes
+      - de afstanden worden kolom voor kolom opgebouwd: in stap j schuift elke
+        rotatie waarvan byte j na de richting nog een cijfer is, dat cijfer in
+        (afstand * 10 + cijfer); het aantal stappen is het langste getal
+    Vereist numpy.
+    """
+    data = np.frombuffer(buf, dtype=np.uint8)
+    n = data.size
+
+    # Klassen per byte (uint8 rondt onder 0 af naar boven, dus één vergelijking)
+    is_digit = (data - ord("0")) < 10
+    is_dir = (data == ord("L")) | (data == ord("R"))
+    is_space = (data == ord(" ")) | ((data - ord("\t")) < 5)  # \t \n \v \f \r
+
+    # Elke rotatie is precies: witruimte, 'L'/'R', één of meer cijfers
+    dir_pos = np.flatnonzero(is_dir)
+    after = dir_pos + 1
+    valid = (
+        np.count_nonzero(is_digit) + dir_pos.size + np.count_nonzero(is_space) == n
+        and is_space[dir_pos[dir_pos > 0] - 1].all()
+        and (after < n).all()
+        and is_digit[after[after < n]].all()
+        and not (n and is_digit[0])
+        and not (is_digit[1:] & ~(is_digit[:-1] | is_dir[:-1])).any()
+    )
+    if not valid:
+        bad = _first_bad_byte(data, is_digit, is_dir, is_space)
+        raise ValueError(f"Onbekende richting in regel: {_token_at(buf, bad)}")
+
+    distances = np.zeros(dir_pos.size, dtype=np.int64)
+    active = np.ones(dir_pos.size, dtype=bool)
+    pos = dir_pos.copy()
+    for offset in range(MAX_DISTANCE_DIGITS + 1):
+        pos += 1
+        active &= pos < n
+        digit = data[np.minimum(pos, n - 1)] - ord("0")
+        active &= digit < 10
+        if not active.any():
+            break
+        if offset == MAX_DISTANCE_DIGITS:
+            raise ValueError("Afstand past niet in een int64.")
+        np.multiply(distances, 10, out=distances, where=active)
+        np.add(distances, digit, out=distances, where=active)
+
+    return np.where(data[dir_pos] == ord("L"), -distances, distances)
+
+
+def _first_bad_byte(data, is_digit, is_dir, is_space) -> int:
+    """Positie van de eerste byte die niet in 'witruimte, L/R, cijfers' past."""
+    space_before = np.concatenate(([True], is_space[:-1]))
+    dir_before = np.concatenate(([False], is_dir[:-1]))
+    digit_before = np.concatenate(([False], is_digit[:-1]))
+    digit_after = np.concatenate((is_digit[1:], [False]))
+
+    bad = ~(is_digit | is_dir | is_space)
+    bad |= is_dir & ~(space_before & digit_after)
+    bad |= is_digit & ~(digit_before | dir_before)
+    return int(np.argmax(bad))
+
+
+def _token_at(buf, pos: int) -> str:
+    """Het stuk tekst (tussen witruimte) rond byte pos, voor foutmeldingen."""
+    start = pos
+    while start > 0 and buf[start - 1] not in WHITESPACE_BYTES:
+        start -= 1
+    end = pos
+    while end < len(buf) and buf[end] not in WHITESPACE_BYTES:
+        end += 1
+    return bytes(buf[start:end]).decode("utf-8", "replace")
+
+def parse_rotations_mmap(filename):
+    """
+    parse_rotations_bytes rechtstreeks op het memory-mapped bestand: de
+    regels worden nooit als str ingelezen. Vereist numpy.
+    """
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return np.zeros(0, dtype=np.int64)  # een leeg bestand kan niet gemapt worden
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return parse_rotations_bytes(mm)
+
+
+def compute_password_end_only_numpy(signed, start=50, modulus=100):
+    """Gevectoriseerde oude methode: eindposities via cumulatieve som modulo 100."""
+    return _end_only_from_offsets(np.cumsum(signed), start, modulus)
+
+
+def compute_password_clicks_numpy(signed, start=50, modulus=100):
+    """Gevectoriseerde nieuwe methode, zelfde uitkomst als compute_password_clicks."""
+    return _clicks_from_offsets(signed, np.cumsum(signed), start, modulus)
+
+
+def _end_only_from_offsets(offsets, start, modulus):
+    positions = (start + offsets) % modulus
+    return int(np.count_nonzero(positions == 0))
+
+
+def _clicks_from_offsets(signed, offsets, start, modulus):
+    """
+    We werken met de 'uitgerolde' positie (zonder modulo). Het aantal nullen
+    tijdens een rotatie is dan het aantal veelvouden van de modulus dat we passeren:
+      - naar rechts van a naar b: floor(b / m) - floor(a / m)
+      - naar links  van a naar b: floor((a - 1) / m) - floor((b - 1) / m)
+    """
+    after = start + offsets
+    before = after - signed
+
+    right = (after // modulus) - (before // modulus)
+    left = ((before - 1) // modulus) - ((after - 1) // modulus)
+
+    return int(np.where(signed >= 0, right, left).sum())
+
+
+def answer_dial_queries_numpy(signed, queries):
+    """
+    Beantwoord een batch (start, modulus)-vragen over dezelfde rotaties.
+    De cumulatieve som wordt één keer berekend en door alle vragen gedeeld.
+    Geeft per vraag (oude methode, nieuwe methode) terug, in dezelfde volgorde.
+    """
+    offsets = np.cumsum(signed)
+    return [
+        (
+            _end_only_from_offsets(offsets, start % modulus, modulus),
+            _clicks_from_offsets(signed, offsets, start % modulus, modulus),
+        )
+        for start, modulus in queries
+    ]
+
+
+def answer_dial_queries(rotations, queries):
+    """
+    Zonder numpy: beantwoord een batch (start, modulus)-vragen in één
+    doorloop over een stroom (richting, afstand)-paren. Elke rotatie wordt dus
+    maar één keer geparsed, hoeveel vragen er ook zijn.
+    Geeft per vraag (oude methode, nieuwe methode) terug, in dezelfde volgorde.
+    """
+    moduli = [modulus for _, modulus in queries]
+    positions = [start % modulus for start, modulus in queries]
+    end_only = [0] * len(queries)
+    clicks = [0] * len(queries)
+
+    for direction, distance in rotations:
+        if direction == 'R':
+            step = distance
+        elif direction == 'L':
+            step = -distance
+        else:
+            raise ValueError(f"Onbekende richting in regel: {direction}{distance}")
+
+        for i, modulus in enumerate(moduli):
+            clicks[i] += zeros_during_rotation(positions[i], direction, distance, modulus)
+            positions[i] = (positions[i] + step) % modulus
+            if positions[i] == 0:
+                end_only[i] += 1
+
+    return list(zip(end_only, clicks))
+
+
+def summarize_chunk(rotations):
+    """
+    Vat een blok (richting, afstand)-paren samen voor alle 100 mogelijke startposities.
+
+    Geeft (shift, zeros) terug: vanuit startpositie s eindigt het blok op
+    (s + shift) % 100 en komt de wijzer onderweg zeros[s] keer op 0.
+    Omdat blokken zo samen te stellen zijn, kunnen ze los (parallel) berekend
+    en daarna op volgorde gevouwen worden.
+    """
+    full_cycles = 0     # volle rondes: tellen voor elke startpositie mee
+    shift = 0           # verschuiving t.o.v. de startpositie, modulo 100
+    diff = [0] * 200    # verschilarray over startposities (met wrap-around)
 
+    for direction, distance in rotations:
+        full_cycles += distance // 100
+        rem = distance % 100
+
+        # Net als in zeros_during_rotation: de rest-klikken halen 0 alleen
+        # als de positie vóór de rotatie in een bepaald interval ligt.
+        if direction == 'R':
+            lo = 100 - rem  # positie in [100 - rem, 99]
+            new_shift = (shift + distance) % 100
+        elif direction == 'L':
+            lo = 1          # positie in [1, rem]
+            new_shift = (shift - distance) % 100
+        else:
+            raise ValueError(f"Onbekende richting in regel: {direction}{distance}")
+
+        if rem:
+            # positie = (s + shift) % 100, dus s loopt vanaf (lo - shift) % 100
+            first = (lo - shift) % 100
+            diff[first] += 1
+            diff[first + rem] -= 1
+
+        shift = new_shift
+
+    running = 0
+    covered = []
+    for delta in diff:
+        running += delta
+        covered.append(running)
+
+    zeros = [full_cycles + covered[s] + covered[s + 100] for s in range(100)]
+    return shift, zeros
+
+
+def fold_chunk_summaries(summaries, start=50):
+    """Vouw de blok-samenvattingen op volgorde tot het totaal aantal nullen."""
+    pos = start
+    total_zeros = 0
+    for shift, zeros in summaries:
+        total_zeros += zeros[pos]
+        pos = (pos + shift) % 100
     return total_zeros
 
 
+def _chunked(items, chunk_size):
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Vanaf deze bestandsgrootte loont het om de rotaties parallel samen te vatten
+PARALLEL_MIN_BYTES = 8 << 20
+
+
+def compute_password_clicks_parallel(filename, chunk_size=100_000, workers=None):
+    """
+    Parallelle variant van compute_password_clicks voor grote rotatielogs:
+    het bestand wordt gestreamd (iter_rotations_mmap), elk blok van chunk_size
+    rotaties wordt in een worker-process samengevat en de samenvattingen worden
+    op volgorde gevouwen. Er staan hooguit 2 * workers blokken tegelijk onderweg.
+    Met workers=1 draait alles in dit proces.
+    """
+    chunks = _chunked(iter_rotations_mmap(filename), chunk_size)
+    if workers == 1:
+        return fold_chunk_summaries(map(summarize_chunk, chunks))
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+
+        def summaries():
+            # Op volgorde van indienen: het oudste blok is altijd als eerste aan de beurt
+            for chunk in chunks:
+                pending.append(pool.submit(summarize_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+        return fold_chunk_summaries(summaries())
+
+
 def test_example():
     example_lines = [
         "L68",
@@ -101,17 +412,57 @@ def test_example():
     ]
     assert compute_password_end_only(example_lines) == 3
     assert compute_password_clicks(example_lines) == 6
+    chunks = _chunked(iter_rotations(example_lines), 3)
+    assert fold_chunk_summaries(summarize_chunk(c) for c in chunks) == 6
+
+    # Parallel vanuit een bestand, in dit proces en met een process pool
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "voorbeeld.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(example_lines) + "\n")
+        assert compute_password_clicks_parallel(path, chunk_size=3, workers=1) == 6
+        assert compute_password_clicks_parallel(path, chunk_size=3, workers=2) == 6
+        if np is not None:
+            assert compute_password_clicks_numpy(parse_rotations_mmap(path)) == 6
+
+    queries = [(50, 100), (0, 100), (7, 10)]
+    answers = answer_dial_queries(iter_rotations(example_lines), queries)
+    assert answers[0] == (3, 6)
+    if np is not None:
+        signed = parse_rotations(example_lines)
+        assert compute_password_end_only_numpy(signed) == 3
+        assert compute_password_clicks_numpy(signed) == 6
+        assert answer_dial_queries_numpy(signed, queries) == answers
+        # Andere witruimte is geldig, een onbekende richting geeft een ValueError
+        assert list(parse_rotations(["L5\f", "R3\v"])) == [-5, 3]
+        assert parse_rotations_bytes(b"L68\r\nR48\n").tolist() == [-68, 48]
+        try:
+            parse_rotations(["L5", "X3"])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("Onbekende richting niet herkend")
     print("Voorbeeldtest geslaagd: oud=3, nieuw=6")
 
 
 def main():
     test_example()  # controleer met het voorbeeld uit de tekst
 
-    with open("input_puzzel_dag1.txt", "r", encoding="utf-8") as f:
-        lines = f.readlines()
+    filename = "input_puzzel_dag1.txt"
 
-    old_password = compute_password_end_only(lines)
-    new_password = compute_password_clicks(lines)
+    if np is not None:
+        # Eén keer parsen (direct uit het gemapte bestand), daarna beide methodes gevectoriseerd
+        signed = parse_rotations_mmap(filename)
+        old_password = compute_password_end_only_numpy(signed)
+        new_password = compute_password_clicks_numpy(signed)
+    else:
+        # Zonder numpy streamen we de rotaties rechtstreeks uit het bestand;
+        # grote logs vatten we op meerdere cores in blokken samen
+        old_password = compute_password_end_only_stream(iter_rotations_mmap(filename))
+        if os.path.getsize(filename) >= PARALLEL_MIN_BYTES and (os.cpu_count() or 1) > 1:
+            new_password = compute_password_clicks_parallel(filename)
+        else:
+            new_password = compute_password_clicks_stream(iter_rotations_mmap(filename))
 
     print("Wachtwoord oude methode (einde van rotaties):", old_password)
     print("Wachtwoord nieuwe methode 0x434C49434B (alle klikken):", new_password)
@@ -1,5 +1,5 @@
 import sys
-from typing import List, Tuple
+from typing import Dict, Iterator, List, Tuple
 import os
 
 def parse_ranges(line: str) -> List[Tuple[int, int]]:
@@ -11,13 +11,12 @@ def parse_ranges(line: str) -> List[Tuple[int, int]]:
     return ranges
 
 
-def find_invalid_ids_in_range(L: int, R: int) -> List[int]:
+def iter_invalid_ids_in_range(L: int, R: int) -> Iterator[int]:
     """
-    Return all invalid IDs in [L, R].
+    Yield all invalid IDs in [L, R] lazily, in sorted order.
     Invalid ID = a decimal string of even length with first half == second half.
+    Works for IDs of any size; nothing is collected in memory.
     """
-    invalids = []
-
     len_L = len(str(L))
     len_R = len(str(R))
 
@@ -41,16 +40,116 @@ def find_invalid_ids_in_range(L: int, R: int) -> List[int]:
         if t_start > t_end:
             continue
 
-        for t in range(t_start, t_end + 1):
-            x = t * factor
-            if L <= x <= R:
-                invalids.append(x)
+        # t * factor for consecutive t: an arithmetic progression with step factor
+        yield from range(t_start * factor, t_end * factor + 1, factor)
 
-    return invalids
+
+def find_invalid_ids_in_range(L: int, R: int) -> List[int]:
+    """
+    Return all invalid IDs in [L, R].
+    Invalid ID = a decimal string of even length with first half == second half.
+    """
+    return list(iter_invalid_ids_in_range(L, R))
+
+
+def count_and_sum_invalid_ids_in_range(L: int, R: int) -> Tuple[int, int]:
+    """
+    Return (count, sum) of the invalid IDs in [L, R] without listing them.
+    Per digit length the invalid IDs are t * factor for consecutive t, so
+    their sum is an arithmetic series: O(1) per length, whatever the width.
+    """
+    count = 0
+    total = 0
+
+    len_L = len(str(L))
+    len_R = len(str(R))
+
+    for full_len in range(len_L, len_R + 1):
+        if full_len % 2 != 0:
+            continue
+
+        half_len = full_len // 2
+        base = 10 ** half_len
+        factor = base + 1
+
+        t_start = max(10 ** (half_len - 1), (L + factor - 1) // factor)
+        t_end = min(base - 1, R // factor)
+
+        if t_start > t_end:
+            continue
+
+        n = t_end - t_start + 1
+        count += n
+        total += factor * (t_start + t_end) * n // 2
+
+    return count, total
 
 
 def sum_invalid_ids_in_range(L: int, R: int) -> int:
-    return sum(find_invalid_ids_in_range(L, R))
+    return count_and_sum_invalid_ids_in_range(L, R)[1]
+
+
+def build_range_index(max_len: int):
+    """
+    Precompute everything a batch of range queries shares, up to max_len digits:
+      - factors[full_len]: the repetition factor 10^half_len + 1 per even length
+      - prefix[n]: (count, sum) of all invalid IDs below 10^n
+    Any [L, R] query is then answered with two prefix lookups.
+    """
+    factors: Dict[int, int] = {}
+    prefix: List[Tuple[int, int]] = [(0, 0)]
+
+    for full_len in range(1, max_len + 1):
+        count, total = prefix[-1]
+
+        if full_len % 2 == 0:
+            half_len = full_len // 2
+            factor = 10 ** half_len + 1
+            factors[full_len] = factor
+
+            t_start = 10 ** (half_len - 1)
+            t_end = 10 ** half_len - 1
+            n = t_end - t_start + 1
+            count += n
+            total += factor * (t_start + t_end) * n // 2
+
+        prefix.append((count, total))
+
+    return factors, prefix
+
+
+def count_and_sum_up_to(index, x: int) -> Tuple[int, int]:
+    """(count, sum) of all invalid IDs <= x, using a build_range_index table."""
+    if x <= 0:
+        return 0, 0
+
+    factors, prefix = index
+    full_len = len(str(x))
+    if full_len >= len(prefix):
+        raise ValueError(f"Index only covers IDs up to {len(prefix) - 1} digits, got {x}.")
+
+    count, total = prefix[full_len - 1]
+
+    factor = factors.get(full_len)
+    if factor is not None:
+        half_len = full_len // 2
+        t_start = 10 ** (half_len - 1)
+        t_end = min(10 ** half_len - 1, x // factor)
+        if t_start <= t_end:
+            n = t_end - t_start + 1
+            count += n
+            total += factor * (t_start + t_end) * n // 2
+
+    return count, total
+
+
+def query_range(index, L: int, R: int) -> Tuple[int, int]:
+    """(count, sum) of the invalid IDs in [L, R] as the difference of two prefixes."""
+    if L > R:
+        return 0, 0
+    count_R, total_R = count_and_sum_up_to(index, R)
+    count_L, total_L = count_and_sum_up_to(index, L - 1)
+    return count_R - count_L, total_R - total_L
 
 
 def run_example_test():
@@ -61,6 +160,7 @@ def run_example_test():
     )
 
     ranges = parse_ranges(example)
+    index = build_range_index(max(len(str(R)) for (_, R) in ranges))
 
     print("=== Example Test ===")
     grand_total = 0
@@ -72,6 +172,14 @@ def run_example_test():
         else:
             print(f"Range {L}-{R}: (none)")
         grand_total += sum(invalids)
+        assert count_and_sum_invalid_ids_in_range(L, R) == (len(invalids), sum(invalids))
+        assert query_range(index, L, R) == (len(invalids), sum(invalids))
+        assert query_range(index, R + 1, L) == (0, 0)
+
+    # Huge ranges: 30+ digit IDs are fine, nothing loops per ID
+    first_32_digit = next(iter_invalid_ids_in_range(10 ** 31, 10 ** 32 - 1))
+    assert first_32_digit == 10 ** 31 + 10 ** 15
+    assert query_range(build_range_index(32), 10 ** 31, 10 ** 32 - 1)[0] == 9 * 10 ** 15
 
     print("\nTotal sum of invalid IDs:")
     print(grand_total)
@@ -96,7 +204,8 @@ def main():
         return
 
     ranges = parse_ranges(data)
-    answer = sum(sum_invalid_ids_in_range(L, R) for (L, R) in ranges)
+    index = build_range_index(max(len(str(R)) for (_, R) in ranges))
+    answer = sum(query_range(index, L, R)[1] for (L, R) in ranges)
 
     print("=== Puzzle Result ===")
     print("Sum of all invalid IDs:")
@@ -1,6 +1,7 @@
 import sys
 import os
-from typing import List, Tuple
+import heapq
+from typing import Dict, Iterator, List, Tuple
 
 
 def parse_ranges(line: str) -> List[Tuple[int, int]]:
@@ -17,8 +18,138 @@ def parse_ranges(line: str) -> List[Tuple[int, int]]:
     return ranges
 
 
+def rep_factor(m: int, k: int) -> int:
+    """
+    rep_factor = 111...1 in "base 10^m" (k keer '1').
+    Bijvoorbeeld m=2, k=3 -> factor = 10^4 + 10^2 + 1 = 10101
+    """
+    pow_m = 10 ** m
+    factor = 0
+    for _ in range(k):
+        factor = factor * pow_m + 1
+    return factor
+
+
+def mobius(n: int) -> int:
+    """Möbiusfunctie μ(n) via proefdeling (n is hier hooguit een aantal digits)."""
+    result = 1
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            n //= p
+            if n % p == 0:
+                return 0
+            result = -result
+        p += 1
+    if n > 1:
+        result = -result
+    return result
+
+
+def _periodic_count_and_sum(L: int, R: int, total_len: int, m: int) -> Tuple[int, int]:
+    """
+    (aantal, som) van alle getallen in [L, R] met total_len digits die uit een
+    blok van m digits bestaan, herhaald (m | total_len). Rekenkundige reeks.
+    """
+    factor = rep_factor(m, total_len // m)
+
+    t_start = max(10 ** (m - 1), (L + factor - 1) // factor)
+    t_end = min(10 ** m - 1, R // factor)
+
+    if t_start > t_end:
+        return 0, 0
+
+    n = t_end - t_start + 1
+    return n, factor * (t_start + t_end) * n // 2
+
+
+def count_and_sum_invalid_ids_in_range(L: int, R: int) -> Tuple[int, int]:
+    """
+    Telmachine: (aantal, som) van de ongeldige IDs in [L, R] zonder ze op te sommen.
+
+    Noem P_m de getallen die een herhaling zijn van een blok van m digits.
+    Een ID met total_len digits is ongeldig als het in P_m zit voor een echte
+    deler m van total_len. Volgens inclusie-exclusie over de delers (Möbius) is
+
+        |vereniging| = som over m | total_len, m < total_len van -μ(total_len / m) * |P_m|
+
+    en hetzelfde geldt voor de sommen. Elke |P_m| is een rekenkundige reeks,
+    dus dit kost O(aantal delers) per lengte, onafhankelijk van de breedte.
+    """
+    count = 0
+    total = 0
+
+    len_L = len(str(L))
+    len_R = len(str(R))
+
+    for total_len in range(len_L, len_R + 1):
+        for m in range(1, total_len // 2 + 1):
+            if total_len % m != 0:
+                continue
+
+            weight = -mobius(total_len // m)
+            if weight == 0:
+                continue
+
+            n, s = _periodic_count_and_sum(L, R, total_len, m)
+            count += weight * n
+            total += weight * s
+
+    return count, total
+
+
+def prime_divisors(n: int) -> List[int]:
+    """Alle verschillende priemdelers van n, oplopend."""
+    primes = []
+    p = 2
+    while p * p <= n:
+        if n % p == 0:
+            primes.append(p)
+            while n % p == 0:
+                n //= p
+        p += 1
+    if n > 1:
+        primes.append(n)
+    return primes
+
+
+def iter_invalid_ids_in_range(L: int, R: int) -> Iterator[int]:
+    """
+    Streamende uitvoer: levert de ongeldige IDs in [L, R] lui en oplopend
+    gesorteerd op, zonder set of lijst. Werkt voor IDs van willekeurige grootte.
+
+    Een blok van lengte m zit ook in elk blok waarvan de lengte een veelvoud
+    van m is, dus per lengte zijn alleen de maximale echte delers
+    m = total_len / p (p priem) nodig. Dat zijn rekenkundige reeksen; die
+    voegen we samen met heapq.merge en dubbele waarden slaan we over.
+    """
+    len_L = len(str(L))
+    len_R = len(str(R))
+
+    for total_len in range(len_L, len_R + 1):
+        streams = []
+        for k in prime_divisors(total_len):
+            m = total_len // k
+            factor = rep_factor(m, k)
+
+            t_start = max(10 ** (m - 1), (L + factor - 1) // factor)
+            t_end = min(10 ** m - 1, R // factor)
+
+            if t_start <= t_end:
+                streams.append(range(t_start * factor, t_end * factor + 1, factor))
+
+        last = None
+        for x in heapq.merge(*streams):
+            if x != last:
+                yield x
+                last = x
+
+
 def find_invalid_ids_in_range(L: int, R: int):
     """
+    Debugmodus: somt alle ongeldige IDs expliciet op (via een set).
+    Gebruik count_and_sum_invalid_ids_in_range voor aantallen en sommen.
+
     Nieuwe regels:
     Een ID is ongeldig als de decimale representatie bestaat uit
     een blok digits dat minstens twee keer herhaald wordt:
@@ -44,22 +175,16 @@ def find_invalid_ids_in_range(L: int, R: int):
             if k < 2:
                 continue
 
-            pow_m = 10 ** m
-
-            # rep_factor = 111...1 in "base 10^m" (k keer '1').
-            # Bijvoorbeeld m=2, k=3 -> factor = 10^4 + 10^2 + 1 = 10101
-            rep_factor = 0
-            for _ in range(k):
-                rep_factor = rep_factor * pow_m + 1
+            factor = rep_factor(m, k)
 
             # t heeft precies m digits (geen leidende nul)
             t_min = 10 ** (m - 1)
-            t_max = pow_m - 1
+            t_max = 10 ** m - 1
 
-            # We willen L <= t * rep_factor <= R
+            # We willen L <= t * factor <= R
             # => grenzen voor t
-            t_lower_bound = (L + rep_factor - 1) // rep_factor  # ceil(L / rep_factor)
-            t_upper_bound = R // rep_factor                      # floor(R / rep_factor)
+            t_lower_bound = (L + factor - 1) // factor  # ceil(L / factor)
+            t_upper_bound = R // factor                 # floor(R / factor)
 
             t_start = max(t_min, t_lower_bound)
             t_end = min(t_max, t_upper_bound)
@@ -68,7 +193,7 @@ def find_invalid_ids_in_range(L: int, R: int):
                 continue
 
             for t in range(t_start, t_end + 1):
-                x = t * rep_factor
+                x = t * factor
                 if L <= x <= R:
                     invalids.add(x)
 
@@ -76,7 +201,77 @@ def find_invalid_ids_in_range(L: int, R: int):
 
 
 def sum_invalid_ids_in_range(L: int, R: int) -> int:
-    return sum(find_invalid_ids_in_range(L, R))
+    return count_and_sum_invalid_ids_in_range(L, R)[1]
+
+
+def build_range_index(max_len: int):
+    """
+    Tabel voor een batch range-queries, tot en met max_len digits:
+      - terms[total_len]: lijst (m, rep_factor, gewicht) voor elke echte deler m
+        met Möbius-gewicht -μ(total_len / m) ongelijk aan 0
+      - prefix[n]: (aantal, som) van alle ongeldige IDs kleiner dan 10^n
+    Een query [L, R] is daarna het verschil van twee prefix-opzoekingen.
+    """
+    terms: Dict[int, List[Tuple[int, int, int]]] = {}
+    prefix: List[Tuple[int, int]] = [(0, 0)]
+
+    for total_len in range(1, max_len + 1):
+        count, total = prefix[-1]
+        terms[total_len] = []
+
+        for m in range(1, total_len // 2 + 1):
+            if total_len % m != 0:
+                continue
+
+            weight = -mobius(total_len // m)
+            if weight == 0:
+                continue
+
+            factor = rep_factor(m, total_len // m)
+            terms[total_len].append((m, factor, weight))
+
+            t_start = 10 ** (m - 1)
+            t_end = 10 ** m - 1
+            n = t_end - t_start + 1
+            count += weight * n
+            total += weight * factor * (t_start + t_end) * n // 2
+
+        prefix.append((count, total))
+
+    return terms, prefix
+
+
+def count_and_sum_up_to(index, x: int) -> Tuple[int, int]:
+    """(aantal, som) van alle ongeldige IDs <= x, met een tabel uit build_range_index."""
+    if x <= 0:
+        return 0, 0
+
+    terms, prefix = index
+    total_len = len(str(x))
+    if total_len >= len(prefix):
+        raise ValueError(f"Index dekt alleen IDs tot {len(prefix) - 1} digits, kreeg {x}.")
+
+    count, total = prefix[total_len - 1]
+
+    for m, factor, weight in terms[total_len]:
+        t_start = 10 ** (m - 1)
+        t_end = min(10 ** m - 1, x // factor)
+        if t_start > t_end:
+            continue
+        n = t_end - t_start + 1
+        count += weight * n
+        total += weight * factor * (t_start + t_end) * n // 2
+
+    return count, total
+
+
+def query_range(index, L: int, R: int) -> Tuple[int, int]:
+    """(aantal, som) van de ongeldige IDs in [L, R] als verschil van twee prefixen."""
+    if L > R:
+        return 0, 0
+    count_R, total_R = count_and_sum_up_to(index, R)
+    count_L, total_L = count_and_sum_up_to(index, L - 1)
+    return count_R - count_L, total_R - total_L
 
 
 def run_example_test():
@@ -87,6 +282,7 @@ def run_example_test():
     )
 
     ranges = parse_ranges(example)
+    index = build_range_index(max(len(str(R)) for (_, R) in ranges))
 
     print("=== Example Test (nieuwe regels) ===")
     grand_total = 0
@@ -95,6 +291,16 @@ def run_example_test():
         invalids = find_invalid_ids_in_range(L, R)
         print(f"Range {L}-{R}: invalid IDs → {invalids}")
         grand_total += sum(invalids)
+        assert count_and_sum_invalid_ids_in_range(L, R) == (len(invalids), sum(invalids))
+        assert query_range(index, L, R) == (len(invalids), sum(invalids))
+        assert query_range(index, R + 1, L) == (0, 0)
+        assert list(iter_invalid_ids_in_range(L, R)) == invalids
+
+    # Enorme ranges: IDs van 30+ digits, zonder lus per ID
+    assert next(iter_invalid_ids_in_range(10 ** 31, 10 ** 32 - 1)) == 10 ** 15 * rep_factor(16, 2)
+    assert query_range(build_range_index(32), 10 ** 31, 10 ** 32 - 1) == (
+        count_and_sum_invalid_ids_in_range(10 ** 31, 10 ** 32 - 1)
+    )
 
     print("\nTotal sum of invalid IDs (example):")
     print(grand_total)
@@ -120,7 +326,8 @@ def main():
         return
 
     ranges = parse_ranges(data)
-    answer = sum(sum_invalid_ids_in_range(L, R) for (L, R) in ranges)
+    index = build_range_index(max(len(str(R)) for (_, R) in ranges))
+    answer = sum(query_range(index, L, R)[1] for (L, R) in ranges)
 
     print("=== Puzzle Result (nieuwe regels) ===")
     print("Sum of all invalid IDs:")
@@ -1,3 +1,13 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optioneel; zonder numpy gebruiken we alleen de scalaire versie
+    np = None
+
+
 def max_joltage_for_bank(line: str) -> int:
     """
     Bepaal de maximaal haalbare 2-cijferige joltage voor één bank.
@@ -30,9 +40,74 @@ def max_joltage_for_bank(line: str) -> int:
     return 10 * d1 + d2
 
 
+def digit_matrix(banks):
+    """
+    Zet banken van gelijke lengte om naar een 2D uint8-matrix met cijfers
+    (één rij per bank). Geeft None terug als dat niet kan; dan gebruiken we
+    de scalaire versie.
+    """
+    if np is None or not banks:
+        return None
+
+    width = len(banks[0])
+    if width < 2:
+        return None
+    for bank in banks:
+        if len(bank) != width or not (bank.isascii() and bank.isdigit()):
+            return None
+
+    raw = np.frombuffer("".join(banks).encode("ascii"), dtype=np.uint8)
+    return raw.reshape(len(banks), width) - ord("0")
+
+
+def total_output_joltage_numpy(digits) -> int:
+    """
+    Batch-variant van max_joltage_for_bank voor alle banken tegelijk.
+    Het beste eerste cijfer vóór positie j is een lopend maximum langs de rij;
+    het beste paar per bank is dan max over j van 10 * lopend_max[j - 1] + d[j].
+    """
+    best_first = np.maximum.accumulate(digits[:, :-1], axis=1).astype(np.int64)
+    pairs = 10 * best_first + digits[:, 1:]
+    return int(pairs.max(axis=1).sum())
+
+
 def total_output_joltage(lines) -> int:
     """Som van de maximale joltages per bank."""
-    return sum(max_joltage_for_bank(line) for line in lines if line.strip())
+    banks = [line.strip() for line in lines if line.strip()]
+
+    # Alle banken even lang: in één keer gevectoriseerd rekenen
+    digits = digit_matrix(banks)
+    if digits is not None:
+        return total_output_joltage_numpy(digits)
+
+    return sum(max_joltage_for_bank(line) for line in banks)
+
+
+def total_output_joltage_streaming(filename: str, chunk_size: int = 100_000, workers=None) -> int:
+    """
+    Streamende, parallelle variant van total_output_joltage: lees het bestand in
+    blokken van chunk_size regels en laat een process pool elk blok uitrekenen.
+    Er staan hooguit 2 * workers blokken tegelijk in het geheugen; de deeltotalen
+    worden opgeteld zodra ze binnenkomen.
+    """
+    workers = workers or os.cpu_count() or 1
+    total = 0
+
+    with open(filename, encoding="utf-8") as f, ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        while True:
+            chunk = list(islice(f, chunk_size))
+            if not chunk:
+                break
+
+            pending.add(pool.submit(total_output_joltage, chunk))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                total += sum(fut.result() for fut in done)
+
+        total += sum(fut.result() for fut in pending)
+
+    return total
 
 
 def main():
@@ -49,13 +124,12 @@ def main():
     assert test_total == expected_test_total, (
         f"Test faalt: verwacht {expected_test_total}, kreeg {test_total}"
     )
+    scalar_total = sum(max_joltage_for_bank(line) for line in test_input)
+    assert scalar_total == expected_test_total
     print("test output:", test_total)
 
     # --- 2. Berekening voor de echte puzzelinput ---
-    with open("input_puzzel_dag3.txt", encoding="utf-8") as f:
-        lines = [line.rstrip("\n") for line in f]
-
-    result = total_output_joltage(lines)
+    result = total_output_joltage_streaming("input_puzzel_dag3.txt")
     print("Totaal output joltage:", result)
 
 
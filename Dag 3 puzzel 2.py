@@ -1,3 +1,7 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
 def max_joltage_for_bank(line: str, k: int = 12) -> int:
     """
     Kies precies k batterijen (cijfers) in volgorde (subsequentie) zodat
@@ -26,8 +30,68 @@ def max_joltage_for_bank(line: str, k: int = 12) -> int:
         stack = stack[:-removals]
 
     # Stack heeft nu precies lengte k en is de maximaal mogelijke subsequentie.
-    result_str = "".join(str(x) for x in stack[:k])
-    return int(result_str)
+    value = 0
+    for d in stack[:k]:
+        value = value * 10 + d
+    return value
+
+
+def build_range_max_table(digits):
+    """
+    Sparse table voor range-maximum-queries:
+    table[j][i] = index van het (linkste) maximum in digits[i : i + 2**j].
+    Opbouw O(n log n), daarna is elke query O(1).
+    """
+    table = [list(range(len(digits)))]
+    span = 1
+    while 2 * span <= len(digits):
+        prev = table[-1]
+        row = []
+        for i in range(len(digits) - 2 * span + 1):
+            a = prev[i]
+            b = prev[i + span]
+            row.append(a if digits[a] >= digits[b] else b)
+        table.append(row)
+        span *= 2
+    return table
+
+
+def range_max_index(digits, table, lo: int, hi: int) -> int:
+    """Index van het linkste maximum in digits[lo..hi] (inclusief)."""
+    j = (hi - lo + 1).bit_length() - 1
+    a = table[j][lo]
+    b = table[j][hi - (1 << j) + 1]
+    # a ligt in het linkerblok; bij gelijke cijfers is a dus de linkste
+    return a if digits[a] >= digits[b] else b
+
+
+def max_joltage_from_table(digits, table, k: int) -> int:
+    """
+    Zelfde uitkomst als max_joltage_for_bank, maar met de sparse table:
+    voor de i-de keuze nemen we het linkste maximum in het venster waaruit
+    nog genoeg cijfers overblijven. Dat zijn k picks van O(1) elk.
+    """
+    n = len(digits)
+    if n < k:
+        raise ValueError(f"Bank heeft te weinig batterijen ({n}) voor k={k}.")
+
+    value = 0
+    pos = 0
+    for remaining in range(k, 0, -1):
+        idx = range_max_index(digits, table, pos, n - remaining)
+        value = value * 10 + digits[idx]
+        pos = idx + 1
+    return value
+
+
+def all_k_joltages(line: str):
+    """
+    Maximale joltage voor elke k = 1..n van één bank. De sparse table wordt
+    één keer gebouwd en door alle k gedeeld. result[k - 1] hoort bij k.
+    """
+    digits = [int(c) for c in line.strip() if c.isdigit()]
+    table = build_range_max_table(digits)
+    return [max_joltage_from_table(digits, table, k) for k in range(1, len(digits) + 1)]
 
 
 def total_output_joltage(lines, k: int = 12) -> int:
@@ -35,6 +99,33 @@ def total_output_joltage(lines, k: int = 12) -> int:
     return sum(max_joltage_for_bank(line, k) for line in lines if line.strip())
 
 
+def total_output_joltage_streaming(filename: str, k: int = 12, chunk_size: int = 100_000, workers=None) -> int:
+    """
+    Streamende, parallelle variant van total_output_joltage: lees het bestand in
+    blokken van chunk_size regels en laat een process pool elk blok uitrekenen.
+    Er staan hooguit 2 * workers blokken tegelijk in het geheugen; de deeltotalen
+    worden opgeteld zodra ze binnenkomen.
+    """
+    workers = workers or os.cpu_count() or 1
+    total = 0
+
+    with open(filename, encoding="utf-8") as f, ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        while True:
+            chunk = list(islice(f, chunk_size))
+            if not chunk:
+                break
+
+            pending.add(pool.submit(total_output_joltage, chunk, k))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                total += sum(fut.result() for fut in done)
+
+        total += sum(fut.result() for fut in pending)
+
+    return total
+
+
 def main():
     # --- 1. Controle met de testinput uit de opgave ---
     test_input = [
@@ -50,11 +141,13 @@ def main():
         f"Test faalt: verwacht {expected_test_total}, kreeg {test_total}"
     )
 
-    # --- 2. Berekening voor de echte puzzelinput ---
-    with open("input_puzzel_dag3.txt", encoding="utf-8") as f:
-        lines = [line.rstrip("\n") for line in f]
+    # Alle-k engine moet voor elke k hetzelfde geven als de stack-methode
+    for line in test_input:
+        expected = [max_joltage_for_bank(line, k) for k in range(1, len(line) + 1)]
+        assert all_k_joltages(line) == expected, f"Alle-k engine faalt voor {line}"
 
-    result = total_output_joltage(lines, k=12)
+    # --- 2. Berekening voor de echte puzzelinput ---
+    result = total_output_joltage_streaming("input_puzzel_dag3.txt", k=12)
     print("Nieuw totaal output joltage:", result)
 
 
@@ -1,4 +1,13 @@
-from typing import List
+import mmap
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optioneel; zonder numpy gebruiken we alleen de scalaire versie
+    np = None
 
 
 # 8 richtingen: horizontaal, verticaal en diagonaal
@@ -9,11 +18,73 @@ NEIGHBOR_DIRS = [
 ]
 
 
-def count_accessible_rolls(grid: List[str]) -> int:
+class BitGrid:
+    """
+    Compact rooster: elke rij is één Python-int als bitset
+    (bit c = kolom c, 1 = rol). Dat kost één bit per cel in plaats van
+    een str-object per cel, en bewerkingen werken op hele rijen tegelijk.
+    """
+
+    def __init__(self, rows: List[int], width: int):
+        self.rows = rows
+        self.width = width
+
+    @classmethod
+    def from_strings(cls, grid: List[str]) -> "BitGrid":
+        width = len(grid[0]) if grid else 0
+        to_bits = str.maketrans({"@": "1", ".": "0"})
+        # Omkeren zodat kolom 0 het minst significante bit wordt
+        rows = [int(row.translate(to_bits)[::-1] or "0", 2) for row in grid]
+        return cls(rows, width)
+
+    def to_strings(self) -> List[str]:
+        to_chars = str.maketrans({"1": "@", "0": "."})
+        return [format(row, f"0{self.width}b")[::-1].translate(to_chars) for row in self.rows]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+def accessible_masks(grid: BitGrid) -> List[int]:
+    """
+    Per rij een bitmasker van de rollen met minder dan 4 @-buren.
+    De acht buren komen uit drie rijen (boven, zelf, onder), elk één bit naar
+    links/rechts geschoven. Die tellen we per bit op met een bitsgewijze
+    opteller (enen, tweeën, en 'vier of meer' als verzadigende bit).
+    """
+    rows = grid.rows
+    masks = []
+
+    for r, row in enumerate(rows):
+        if not row:
+            masks.append(0)
+            continue
+
+        up = rows[r - 1] if r > 0 else 0
+        down = rows[r + 1] if r + 1 < len(rows) else 0
+
+        ones = twos = fours = 0
+        for x in (up << 1, up, up >> 1, row << 1, row >> 1, down << 1, down, down >> 1):
+            carry = ones & x
+            ones ^= x
+            fours |= twos & carry
+            twos ^= carry
+
+        # Bits buiten de breedte vallen weg doordat we met 'row' maskeren
+        masks.append(row & ~fours)
+
+    return masks
+
+
+def count_accessible_rolls(grid: Union[List[str], BitGrid]) -> int:
     """
     Tel het aantal rollen (@) die minder dan 4 @-buren hebben
     in de 8 aangrenzende posities.
+    Werkt ook op een BitGrid.
     """
+    if isinstance(grid, BitGrid):
+        return sum(mask.bit_count() for mask in accessible_masks(grid))
+
     if not grid:
         return 0
 
@@ -41,6 +112,107 @@ def count_accessible_rolls(grid: List[str]) -> int:
     return total
 
 
+def grid_to_array(grid: List[str]):
+    """Zet het rooster om naar een 0/1 uint8-array (1 = rol). Vereist numpy."""
+    rows = len(grid)
+    cols = len(grid[0])
+    raw = np.frombuffer("".join(grid).encode("ascii"), dtype=np.uint8).reshape(rows, cols)
+    return (raw == ord("@")).astype(np.uint8)
+
+
+def neighbor_counts_numpy(occupied):
+    """
+    Aantal @-buren voor elke cel tegelijk: pad het rooster met een rand van
+    nullen en tel de acht verschoven kopieën op (een 3x3 box filter zonder
+    het midden).
+    """
+    rows, cols = occupied.shape
+    padded = np.pad(occupied, 1)
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for dr, dc in NEIGHBOR_DIRS:
+        counts += padded[1 + dr : 1 + dr + rows, 1 + dc : 1 + dc + cols]
+    return counts
+
+
+def count_accessible_rolls_numpy(grid: List[str]) -> int:
+    """Gevectoriseerde variant van count_accessible_rolls."""
+    if not grid:
+        return 0
+
+    occupied = grid_to_array(grid)
+    counts = neighbor_counts_numpy(occupied)
+    return int(np.count_nonzero(occupied.astype(bool) & (counts < 4)))
+
+
+def _mapped_layout(mm) -> Tuple[int, int, int]:
+    """
+    Bepaal (breedte, stride, aantal rijen) van een gemapt rooster.
+    We gaan uit van even lange rijen met steeds hetzelfde regeleinde,
+    zodat rij r op byte-offset r * stride begint.
+    """
+    first_nl = mm.find(b"\n")
+    if first_nl == -1:
+        width = len(mm)
+        return width, width + 1, 1 if width else 0
+
+    width = first_nl
+    if width and mm[width - 1 : width] == b"\r":
+        width -= 1
+    stride = first_nl + 1
+
+    rows = len(mm) // stride
+    if len(mm) - rows * stride >= width > 0:
+        rows += 1  # laatste regel zonder regeleinde
+    return width, stride, rows
+
+
+def _read_band(mm, layout: Tuple[int, int, int], start: int, end: int) -> BitGrid:
+    """Lees rijen [start, end) uit het gemapte bestand als BitGrid."""
+    width, stride, rows = layout
+    start = max(start, 0)
+    end = min(end, rows)
+    band = [
+        mm[r * stride : r * stride + width].decode("ascii")
+        for r in range(start, end)
+    ]
+    return BitGrid.from_strings(band) if band else BitGrid([], width)
+
+
+def _count_band(filename: str, start: int, end: int) -> int:
+    """Tel de toegankelijke rollen in rijen [start, end), met één halo-rij aan elke kant."""
+    with open(filename, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        layout = _mapped_layout(mm)
+        band = _read_band(mm, layout, start - 1, end + 1)
+
+    masks = accessible_masks(band)
+    # Halo-rijen tellen niet mee: die horen bij de buurband
+    first = 1 if start > 0 else 0
+    return sum(mask.bit_count() for mask in masks[first : first + (end - start)])
+
+
+def count_accessible_rolls_tiled(filename: str, band_rows: int = 1024, workers=None) -> int:
+    """
+    Deel 1 voor kaarten groter dan het geheugen: memory-map het bestand en
+    verwerk het in banden van band_rows rijen (met één halo-rij boven en onder).
+    De banden gaan naar een process pool; met workers=1 draait alles in dit proces.
+    """
+    if os.path.getsize(filename) == 0:
+        return 0  # een leeg bestand kan niet gemapt worden
+
+    with open(filename, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        _, _, rows = _mapped_layout(mm)
+
+    starts = list(range(0, rows, band_rows))
+    ends = [min(start + band_rows, rows) for start in starts]
+    names = [filename] * len(starts)
+
+    if workers == 1:
+        return sum(map(_count_band, names, starts, ends))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_count_band, names, starts, ends))
+
+
 def test_example() -> None:
     """
     Controleer dat de gegeven voorbeeldkaart 13 oplevert.
@@ -61,6 +233,24 @@ def test_example() -> None:
     result = count_accessible_rolls(example_grid)
     expected = 13
     assert result == expected, f"Example failed: got {result}, expected {expected}"
+    if np is not None:
+        result_numpy = count_accessible_rolls_numpy(example_grid)
+        assert result_numpy == expected, f"Numpy example failed: got {result_numpy}"
+    result_bits = count_accessible_rolls(BitGrid.from_strings(example_grid))
+    assert result_bits == expected, f"BitGrid example failed: got {result_bits}"
+
+    # Getegelde variant op een tijdelijk bestand, met kleine banden
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "voorbeeld.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(example_grid) + "\n")
+        result_tiled = count_accessible_rolls_tiled(path, band_rows=3, workers=1)
+
+        # Een leeg bestand geeft geen rollen (en kan niet gemapt worden)
+        empty = os.path.join(tmp, "leeg.txt")
+        open(empty, "w").close()
+        assert count_accessible_rolls_tiled(empty, workers=1) == 0
+    assert result_tiled == expected, f"Tiled example failed: got {result_tiled}"
     print(f"Test geslaagd: voorbeeld geeft {result} (verwacht {expected})")
 
 
@@ -84,7 +274,10 @@ def main() -> None:
     grid = read_puzzle_input("input_puzzel_dag4.txt")
 
     # 3. Bereken en print het aantal toegankelijke rollen
-    result = count_accessible_rolls(grid)
+    if np is not None:
+        result = count_accessible_rolls_numpy(grid)
+    else:
+        result = count_accessible_rolls(grid)
     print("Aantal rollen dat door een vorkheftruck kan worden bereikt:", result)
 
 
@@ -1,4 +1,16 @@
-from typing import List, Tuple
+import json
+import mmap
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple, TypeVar, Union
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optioneel; zonder numpy gebruiken we alleen de scalaire versie
+    np = None
+
 
 # 8 richtingen: horizontaal, verticaal en diagonaal
 NEIGHBOR_DIRS = [
@@ -8,12 +20,119 @@ NEIGHBOR_DIRS = [
 ]
 
 
-def count_accessible_rolls(grid: List[str]) -> int:
+class BitGrid:
+    """
+    Compact rooster: elke rij is één Python-int als bitset
+    (bit c = kolom c, 1 = rol). Dat kost één bit per cel in plaats van
+    een str-object per cel, en bewerkingen werken op hele rijen tegelijk.
+    """
+
+    def __init__(self, rows: List[int], width: int):
+        self.rows = rows
+        self.width = width
+
+    @classmethod
+    def from_strings(cls, grid: List[str]) -> "BitGrid":
+        width = len(grid[0]) if grid else 0
+        to_bits = str.maketrans({"@": "1", ".": "0"})
+        # Omkeren zodat kolom 0 het minst significante bit wordt
+        rows = [int(row.translate(to_bits)[::-1] or "0", 2) for row in grid]
+        return cls(rows, width)
+
+    def to_strings(self) -> List[str]:
+        to_chars = str.maketrans({"1": "@", "0": "."})
+        return [format(row, f"0{self.width}b")[::-1].translate(to_chars) for row in self.rows]
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+# Rooster als lijst van strings of bit-packed; simulate_removals geeft hetzelfde type terug
+GridT = TypeVar("GridT", List[str], BitGrid)
+
+
+class CascadeStats:
+    """
+    Optionele instrumentatie voor de verwijdercascade van deel 2.
+    Per ronde (voor alle engines hetzelfde gedefinieerd):
+      - removed:  aantal rollen dat deze ronde verwijderd is
+      - frontier: aantal rollen dat deze ronde als kandidaat gecontroleerd is
+                  (volledige scan: alle resterende rollen; incrementeel: in
+                  ronde 1 alle rollen, daarna de rollen waarvan de burenteller
+                  door de vorige ronde is verlaagd)
+      - scanned:  aantal verschillende cellen dat gelezen is om dat te bepalen
+                  (nooit meer dan het aantal cellen in het rooster)
+      - seconds:  wandkloktijd van de ronde
+    De laatste ronde is altijd de controle die niets meer verwijdert
+    (removed == 0), zodat het aantal rondes niet van de engine afhangt.
+    """
+
+    def __init__(self, engine: str = ""):
+        self.engine = engine
+        self.rounds: List[dict] = []
+
+    def record_round(self, removed: int, frontier: int, scanned: int, seconds: float) -> None:
+        self.rounds.append({
+            "round": len(self.rounds) + 1,
+            "removed": removed,
+            "frontier": frontier,
+            "scanned": scanned,
+            "seconds": seconds,
+        })
+
+    def to_dict(self) -> dict:
+        return {
+            "engine": self.engine,
+            "rounds": self.rounds,
+            "total_removed": sum(r["removed"] for r in self.rounds),
+            "total_seconds": sum(r["seconds"] for r in self.rounds),
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+def accessible_masks(grid: BitGrid) -> List[int]:
+    """
+    Per rij een bitmasker van de rollen met minder dan 4 @-buren.
+    De acht buren komen uit drie rijen (boven, zelf, onder), elk één bit naar
+    links/rechts geschoven. Die tellen we per bit op met een bitsgewijze
+    opteller (enen, tweeën, en 'vier of meer' als verzadigende bit).
+    """
+    rows = grid.rows
+    masks = []
+
+    for r, row in enumerate(rows):
+        if not row:
+            masks.append(0)
+            continue
+
+        up = rows[r - 1] if r > 0 else 0
+        down = rows[r + 1] if r + 1 < len(rows) else 0
+
+        ones = twos = fours = 0
+        for x in (up << 1, up, up >> 1, row << 1, row >> 1, down << 1, down, down >> 1):
+            carry = ones & x
+            ones ^= x
+            fours |= twos & carry
+            twos ^= carry
+
+        # Bits buiten de breedte vallen weg doordat we met 'row' maskeren
+        masks.append(row & ~fours)
+
+    return masks
+
+
+def count_accessible_rolls(grid: Union[List[str], BitGrid]) -> int:
     """
     Deel 1:
     Tel het aantal rollen (@) die minder dan 4 @-buren hebben
     in de 8 aangrenzende posities.
+    Werkt ook op een BitGrid.
     """
+    if isinstance(grid, BitGrid):
+        return sum(mask.bit_count() for mask in accessible_masks(grid))
+
     if not grid:
         return 0
 
@@ -41,7 +160,126 @@ def count_accessible_rolls(grid: List[str]) -> int:
     return total
 
 
-def simulate_removals(grid: List[str]) -> Tuple[int, List[str]]:
+def simulate_removals_incremental(
+    grid: List[str], stats: Optional[CascadeStats] = None
+) -> Tuple[int, List[str]]:
+    """
+    Deel 2, incrementeel (zelfde uitkomst als simulate_removals):
+      - tel de buren van elke cel één keer
+      - verwijder per ronde alleen de frontier (rollen met minder dan 4 buren)
+      - verlaag daarna alleen de tellers van hun buren; een rol die daardoor
+        van 4 naar 3 zakt, komt op de frontier van de volgende ronde
+    Totale kosten: O(cellen + verwijderingen) in plaats van O(rondes x cellen).
+    Met stats (een CascadeStats) worden per ronde statistieken bijgehouden.
+    """
+    if not grid:
+        return 0, grid
+
+    rows = len(grid)
+    cols = len(grid[0])
+
+    started = time.perf_counter()
+    current = [list(row) for row in grid]
+
+    # Buurtellers één keer opbouwen: elke rol verhoogt de teller van zijn buren
+    counts = [[0] * cols for _ in range(rows)]
+    for r in range(rows):
+        for c in range(cols):
+            if current[r][c] != "@":
+                continue
+            for dr, dc in NEIGHBOR_DIRS:
+                rr = r + dr
+                cc = c + dc
+                if 0 <= rr < rows and 0 <= cc < cols:
+                    counts[rr][cc] += 1
+
+    frontier = [
+        (r, c)
+        for r in range(rows)
+        for c in range(cols)
+        if current[r][c] == "@" and counts[r][c] < 4
+    ]
+
+    total_removed = 0
+    # Statistieken voor ronde 1: de initiële telling leest elke cel en elke rol
+    checked = sum(row.count("@") for row in grid)
+    scanned = rows * cols
+
+    while True:
+        if stats is not None:
+            now = time.perf_counter()
+            stats.record_round(len(frontier), checked, scanned, now - started)
+            started = now
+        if not frontier:
+            break
+
+        # Eerst de hele ronde tegelijk verwijderen...
+        for r, c in frontier:
+            current[r][c] = "."
+        total_removed += len(frontier)
+
+        # ...daarna alleen de buren van de verwijderde rollen bijwerken
+        next_frontier = []
+        read_cells = set()
+        touched_rolls = set()
+        for r, c in frontier:
+            for dr, dc in NEIGHBOR_DIRS:
+                rr = r + dr
+                cc = c + dc
+                if 0 <= rr < rows and 0 <= cc < cols:
+                    if stats is not None:
+                        read_cells.add((rr, cc))
+                    if current[rr][cc] == "@":
+                        if stats is not None:
+                            touched_rolls.add((rr, cc))
+                        counts[rr][cc] -= 1
+                        if counts[rr][cc] == 3:
+                            next_frontier.append((rr, cc))
+
+        # Dit werk bepaalt de kandidaten van de volgende ronde
+        checked = len(touched_rolls)
+        scanned = len(read_cells)
+        frontier = next_frontier
+
+    final_grid = ["".join(row) for row in current]
+    return total_removed, final_grid
+
+
+def grid_to_array(grid: List[str]):
+    """Zet het rooster om naar een 0/1 uint8-array (1 = rol). Vereist numpy."""
+    rows = len(grid)
+    cols = len(grid[0])
+    raw = np.frombuffer("".join(grid).encode("ascii"), dtype=np.uint8).reshape(rows, cols)
+    return (raw == ord("@")).astype(np.uint8)
+
+
+def neighbor_counts_numpy(occupied):
+    """
+    Aantal @-buren voor elke cel tegelijk: pad het rooster met een rand van
+    nullen en tel de acht verschoven kopieën op (een 3x3 box filter zonder
+    het midden).
+    """
+    rows, cols = occupied.shape
+    padded = np.pad(occupied, 1)
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    for dr, dc in NEIGHBOR_DIRS:
+        counts += padded[1 + dr : 1 + dr + rows, 1 + dc : 1 + dc + cols]
+    return counts
+
+
+def count_accessible_rolls_numpy(grid: List[str]) -> int:
+    """Gevectoriseerde variant van count_accessible_rolls."""
+    if not grid:
+        return 0
+
+    occupied = grid_to_array(grid)
+    counts = neighbor_counts_numpy(occupied)
+    return int(np.count_nonzero(occupied.astype(bool) & (counts < 4)))
+
+
+def simulate_removals(
+    grid: GridT, stats: Optional[CascadeStats] = None
+) -> Tuple[int, GridT]:
     """
     Deel 2:
     Herhaal:
@@ -51,7 +289,30 @@ def simulate_removals(grid: List[str]) -> Tuple[int, List[str]]:
     Geef terug:
       - totaal aantal verwijderde rollen
       - het eindraster als lijst van strings
+    Op een BitGrid wordt elke ronde met bitoperaties per rij gedaan en is
+    het eindraster ook een BitGrid.
+    Met stats (een CascadeStats) worden per ronde statistieken bijgehouden.
     """
+    if isinstance(grid, BitGrid):
+        rows = list(grid.rows)
+        total_removed = 0
+        while True:
+            started = time.perf_counter()
+            masks = accessible_masks(BitGrid(rows, grid.width))
+            removed = sum(mask.bit_count() for mask in masks)
+            if stats is not None:
+                stats.record_round(
+                    removed,
+                    sum(row.bit_count() for row in rows),
+                    len(rows) * grid.width,
+                    time.perf_counter() - started,
+                )
+            if not removed:
+                break
+            rows = [row & ~mask for row, mask in zip(rows, masks)]
+            total_removed += removed
+        return total_removed, BitGrid(rows, grid.width)
+
     if not grid:
         return 0, grid
 
@@ -64,13 +325,16 @@ def simulate_removals(grid: List[str]) -> Tuple[int, List[str]]:
     total_removed = 0
 
     while True:
+        started = time.perf_counter()
         to_remove = []
+        checked = 0
 
         # Zoek alle verwijderbare rollen in de huidige toestand
         for r in range(rows):
             for c in range(cols):
                 if current[r][c] != "@":
                     continue
+                checked += 1
 
                 neighbor_count = 0
                 for dr, dc in NEIGHBOR_DIRS:
@@ -83,6 +347,10 @@ def simulate_removals(grid: List[str]) -> Tuple[int, List[str]]:
                 if neighbor_count < 4:
                     to_remove.append((r, c))
 
+        if stats is not None:
+            elapsed = time.perf_counter() - started
+            stats.record_round(len(to_remove), checked, rows * cols, elapsed)
+
         # Als er niets meer verwijderd kan worden: klaar
         if not to_remove:
             break
@@ -98,6 +366,140 @@ def simulate_removals(grid: List[str]) -> Tuple[int, List[str]]:
     return total_removed, final_grid
 
 
+def _mapped_layout(mm) -> Tuple[int, int, int]:
+    """
+    Bepaal (breedte, stride, aantal rijen) van een gemapt rooster.
+    We gaan uit van even lange rijen met steeds hetzelfde regeleinde,
+    zodat rij r op byte-offset r * stride begint.
+    """
+    first_nl = mm.find(b"\n")
+    if first_nl == -1:
+        width = len(mm)
+        return width, width + 1, 1 if width else 0
+
+    width = first_nl
+    if width and mm[width - 1 : width] == b"\r":
+        width -= 1
+    stride = first_nl + 1
+
+    rows = len(mm) // stride
+    if len(mm) - rows * stride >= width > 0:
+        rows += 1  # laatste regel zonder regeleinde
+    return width, stride, rows
+
+
+def _read_band(mm, layout: Tuple[int, int, int], start: int, end: int) -> BitGrid:
+    """Lees rijen [start, end) uit het gemapte bestand als BitGrid."""
+    width, stride, rows = layout
+    start = max(start, 0)
+    end = min(end, rows)
+    band = [
+        mm[r * stride : r * stride + width].decode("ascii")
+        for r in range(start, end)
+    ]
+    return BitGrid.from_strings(band) if band else BitGrid([], width)
+
+
+def _count_band(filename: str, start: int, end: int) -> int:
+    """Tel de toegankelijke rollen in rijen [start, end), met één halo-rij aan elke kant."""
+    with open(filename, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        layout = _mapped_layout(mm)
+        band = _read_band(mm, layout, start - 1, end + 1)
+
+    masks = accessible_masks(band)
+    # Halo-rijen tellen niet mee: die horen bij de buurband
+    first = 1 if start > 0 else 0
+    return sum(mask.bit_count() for mask in masks[first : first + (end - start)])
+
+
+def count_accessible_rolls_tiled(filename: str, band_rows: int = 1024, workers=None) -> int:
+    """
+    Deel 1 voor kaarten groter dan het geheugen: memory-map het bestand en
+    verwerk het in banden van band_rows rijen (met één halo-rij boven en onder).
+    De banden gaan naar een process pool; met workers=1 draait alles in dit proces.
+    """
+    if os.path.getsize(filename) == 0:
+        return 0  # een leeg bestand kan niet gemapt worden
+
+    with open(filename, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        _, _, rows = _mapped_layout(mm)
+
+    starts = list(range(0, rows, band_rows))
+    ends = [min(start + band_rows, rows) for start in starts]
+    names = [filename] * len(starts)
+
+    if workers == 1:
+        return sum(map(_count_band, names, starts, ends))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_count_band, names, starts, ends))
+
+
+def _settle_band(above: int, rows: List[int], below: int, width: int) -> Tuple[int, List[int]]:
+    """
+    Verwijder rollen binnen één band tot er niets meer verandert, met vaste
+    halo-rijen erboven en eronder (die zelf niet aangepast worden).
+    """
+    full = [above] + rows + [below]
+    total_removed = 0
+
+    while True:
+        masks = accessible_masks(BitGrid(full, width))
+        masks[0] = masks[-1] = 0
+        removed = sum(mask.bit_count() for mask in masks)
+        if not removed:
+            break
+        full = [row & ~mask for row, mask in zip(full, masks)]
+        total_removed += removed
+
+    return total_removed, full[1:-1]
+
+
+def simulate_removals_tiled(filename: str, band_rows: int = 1024) -> Tuple[int, BitGrid]:
+    """
+    Deel 2 in banden: elke band wordt bit-packed (één bit per cel) uit het
+    gemapte bestand gelezen en lokaal uitgeput met de randrijen van de buurbanden
+    als halo. Verandert een band, dan worden de buren opnieuw bekeken; dat herhalen
+    we tot geen enkele band meer verandert.
+
+    Omdat verwijderen alleen maar minder buren oplevert, hangt de eindtoestand
+    niet af van de volgorde: het totaal is gelijk aan dat van simulate_removals.
+    """
+    if os.path.getsize(filename) == 0:
+        return 0, BitGrid([], 0)  # een leeg bestand kan niet gemapt worden
+
+    with open(filename, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        layout = _mapped_layout(mm)
+        width, _, rows = layout
+        tiles = [
+            _read_band(mm, layout, start, start + band_rows).rows
+            for start in range(0, rows, band_rows)
+        ]
+
+    total_removed = 0
+    dirty = set(range(len(tiles)))
+
+    while dirty:
+        i = min(dirty)
+        dirty.discard(i)
+
+        above = tiles[i - 1][-1] if i > 0 else 0
+        below = tiles[i + 1][0] if i + 1 < len(tiles) else 0
+        removed, new_rows = _settle_band(above, tiles[i], below, width)
+        if not removed:
+            continue
+
+        total_removed += removed
+        # Alleen als een randrij verandert, moet de buurband opnieuw
+        if i > 0 and new_rows[0] != tiles[i][0]:
+            dirty.add(i - 1)
+        if i + 1 < len(tiles) and new_rows[-1] != tiles[i][-1]:
+            dirty.add(i + 1)
+        tiles[i] = new_rows
+
+    return total_removed, BitGrid([row for tile in tiles for row in tile], width)
+
+
 def test_example() -> None:
     """
     Controleer dat de gegeven voorbeeldkaart:
@@ -123,6 +525,8 @@ def test_example() -> None:
     assert part1_result == expected_part1, (
         f"Example deel 1 faalt: kreeg {part1_result}, verwacht {expected_part1}"
     )
+    if np is not None:
+        assert count_accessible_rolls_numpy(example_grid) == expected_part1
 
     # Deel 2 test
     total_removed, _ = simulate_removals(example_grid)
@@ -130,6 +534,46 @@ def test_example() -> None:
     assert total_removed == expected_removed, (
         f"Example deel 2 faalt: kreeg {total_removed}, verwacht {expected_removed}"
     )
+    assert simulate_removals_incremental(example_grid) == simulate_removals(example_grid)
+
+    # Instrumentatie: beide engines verwijderen per ronde hetzelfde aantal rollen
+    full_stats = CascadeStats("volledig")
+    incremental_stats = CascadeStats("incrementeel")
+    simulate_removals(example_grid, stats=full_stats)
+    simulate_removals_incremental(example_grid, stats=incremental_stats)
+    bit_stats = CascadeStats("bits")
+    simulate_removals(BitGrid.from_strings(example_grid), stats=bit_stats)
+    cells = len(example_grid) * len(example_grid[0])
+    removed_per_round = [r["removed"] for r in full_stats.rounds]
+    assert removed_per_round[-1] == 0
+    for engine_stats in (bit_stats, incremental_stats):
+        assert [r["removed"] for r in engine_stats.rounds] == removed_per_round
+        assert engine_stats.rounds[0]["frontier"] == full_stats.rounds[0]["frontier"]
+        assert all(r["scanned"] <= cells for r in engine_stats.rounds)
+    assert [r["frontier"] for r in bit_stats.rounds] == [r["frontier"] for r in full_stats.rounds]
+    assert json.loads(incremental_stats.to_json())["total_removed"] == expected_removed
+
+    # Zelfde uitkomsten op het bit-packed rooster
+    bits = BitGrid.from_strings(example_grid)
+    assert count_accessible_rolls(bits) == expected_part1
+    removed_bits, final_bits = simulate_removals(bits)
+    assert (removed_bits, final_bits.to_strings()) == simulate_removals(example_grid)
+
+    # Getegelde varianten op een tijdelijk bestand, met kleine banden
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "voorbeeld.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(example_grid) + "\n")
+        assert count_accessible_rolls_tiled(path, band_rows=3, workers=1) == expected_part1
+        removed_tiled, final_tiled = simulate_removals_tiled(path, band_rows=3)
+
+        # Een leeg bestand geeft geen rollen (en kan niet gemapt worden)
+        empty = os.path.join(tmp, "leeg.txt")
+        open(empty, "w").close()
+        assert count_accessible_rolls_tiled(empty, workers=1) == 0
+        removed_empty, final_empty = simulate_removals_tiled(empty)
+        assert (removed_empty, final_empty.to_strings()) == (0, [])
+    assert (removed_tiled, final_tiled.to_strings()) == simulate_removals(example_grid)
 
     print(
         f"Tests geslaagd: deel 1 = {part1_result} (13), "
@@ -156,12 +600,17 @@ def main() -> None:
     grid = read_puzzle_input("input_puzzel_dag4.txt")
 
     # 3. Deel 1: aantal direct toegankelijke rollen
-    part1 = count_accessible_rolls(grid)
+    if np is not None:
+        part1 = count_accessible_rolls_numpy(grid)
+    else:
+        part1 = count_accessible_rolls(grid)
     print("Deel 1 - aantal direct toegankelijke rollen:", part1)
 
     # 4. Deel 2: totaal aantal verwijderde rollen na herhaald verwijderen
-    total_removed, _ = simulate_removals(grid)
+    stats = CascadeStats("incrementeel")
+    total_removed, _ = simulate_removals_incremental(grid, stats=stats)
     print("Deel 2 - totaal aantal verwijderde rollen:", total_removed)
+    print("Deel 2 - aantal rondes met verwijderingen:", len(stats.rounds) - 1)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,25 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_right
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optioneel; zonder numpy gebruiken we alleen bisect
+    np = None
+
+
+# Binair indexbestand voor de samengevoegde ranges (zie write_interval_index)
+INDEX_MAGIC = b"DAG5IDX1"
+INDEX_HEADER = "<8s32sQ"
+INDEX_FILENAME = "input_puzzel_dag5.idx"
+
+
 def parse_ranges(ranges_str: str):
     """Zet tekst met regels 'start-end' om naar een lijst (start, end)-tuples."""
     ranges = []
@@ -10,18 +32,245 @@ def parse_ranges(ranges_str: str):
     return ranges
 
 
+def merge_ranges(ranges):
+    """Voeg overlappende of aansluitende ranges samen (zelfde logica als deel 2)."""
+    if not ranges:
+        return []
+
+    # Sorteer op startpunt
+    ranges.sort()
+    merged = [ranges[0]]
+
+    for start, end in ranges[1:]:
+        last_start, last_end = merged[-1]
+
+        if start <= last_end + 1:
+            # Overlap of aansluitend: samenvoegen
+            merged[-1] = (last_start, max(last_end, end))
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
+def build_interval_index(ranges):
+    """
+    Bouw één keer een gesorteerde index van disjuncte intervallen:
+    twee lijsten (starts, ends), zodat elke ID met bisect opgezocht kan worden.
+    """
+    merged = merge_ranges(list(ranges))
+    starts = [start for start, _ in merged]
+    ends = [end for _, end in merged]
+    return starts, ends
+
+
+def is_fresh(index, x: int) -> bool:
+    """Ligt x in één van de intervallen? O(log ranges) via bisect."""
+    starts, ends = index
+    i = bisect_right(starts, x) - 1
+    return i >= 0 and x <= ends[i]
+
+
+def parse_ids(ids_str: str):
+    """Zet de ID-sectie om naar een lijst ints; lege regels worden overgeslagen."""
+    return [int(token) for token in ids_str.split()]
+
+
 def count_fresh_ids(ranges, ids_str: str) -> int:
     """Tel hoeveel IDs in ids_str in minstens één range vallen."""
-    fresh_count = 0
-    for line in ids_str.strip().splitlines():
-        line = line.strip()
-        if not line:
-            continue
-        x = int(line)
-        # Check of x in één van de ranges valt
-        if any(start <= x <= end for (start, end) in ranges):
-            fresh_count += 1
-    return fresh_count
+    return count_fresh_ids_in_index(build_interval_index(ranges), parse_ids(ids_str))
+
+
+def count_fresh_ids_in_index(index, ids) -> int:
+    """Zelfde telling, maar met een al gebouwde (of van schijf geladen) index."""
+    return sum(1 for x in ids if is_fresh(index, x))
+
+
+def count_fresh_ids_numpy(index, ids) -> int:
+    """
+    Batch-variant voor miljoenen IDs: np.searchsorted zoekt voor alle IDs
+    tegelijk het laatste interval met start <= ID. Vereist numpy en IDs die
+    in een int64 passen (anders OverflowError). starts/ends die al int64-arrays
+    zijn, worden niet opnieuw omgezet.
+    """
+    starts, ends = index
+    if len(starts) == 0:
+        return 0
+
+    starts = np.asarray(starts, dtype=np.int64)
+    ends = np.asarray(ends, dtype=np.int64)
+    ids = np.asarray(ids, dtype=np.int64)
+
+    i = np.searchsorted(starts, ids, side="right") - 1
+    fresh = (i >= 0) & (ids <= ends[np.maximum(i, 0)])
+    return int(np.count_nonzero(fresh))
+
+
+def write_interval_index(path: str, digest: bytes, index) -> bool:
+    """
+    Schrijf de samengevoegde intervallen naar een compact binair indexbestand:
+    header (magic, sha256 van de ranges-sectie, aantal) gevolgd door alle
+    starts en daarna alle ends als little-endian int64.
+    Geeft False terug als de waarden niet in een int64 passen.
+    """
+    starts, ends = index
+    try:
+        body = array("q", starts).tobytes() + array("q", ends).tobytes()
+    except OverflowError:
+        return False
+    if sys.byteorder != "little":
+        return False
+
+    # Eerst naar een tijdelijk bestand en dan atomair vervangen: een proces dat
+    # de oude index nog gemapt heeft, blijft zo een geldig bestand zien.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(struct.pack(INDEX_HEADER, INDEX_MAGIC, digest, len(starts)))
+            f.write(body)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+
+def load_interval_index(path: str, digest: bytes):
+    """
+    Memory-map een indexbestand en geef (starts, ends) terug als int64-views
+    (bruikbaar met bisect en numpy). None als het bestand ontbreekt of niet bij
+    deze ranges-sectie hoort.
+    """
+    if not os.path.exists(path) or sys.byteorder != "little":
+        return None
+
+    header_size = struct.calcsize(INDEX_HEADER)
+    with open(path, "rb") as f:
+        header = f.read(header_size)
+        if len(header) < header_size:
+            return None
+        magic, stored_digest, n = struct.unpack(INDEX_HEADER, header)
+        if magic != INDEX_MAGIC or stored_digest != digest:
+            return None
+        if os.fstat(f.fileno()).st_size != header_size + 16 * n:
+            return None
+        if n == 0:
+            return [], []
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    values = memoryview(mm)[header_size:].cast("q")
+    return values[:n], values[n:]
+
+
+def open_interval_index(path: str, ranges_part: str):
+    """
+    Laad de index van schijf als de ranges-sectie niet veranderd is; anders
+    opnieuw parsen, samenvoegen en het indexbestand herschrijven.
+    """
+    # Regels genormaliseerd hashen (zonder \r of lege regels), zodat deel 1 en 2
+    # voor dezelfde ranges dezelfde digest en dus hetzelfde indexbestand gebruiken.
+    normalized = "\n".join(line.strip() for line in ranges_part.splitlines() if line.strip())
+    digest = hashlib.sha256(normalized.encode("utf-8")).digest()
+    index = load_interval_index(path, digest)
+    if index is None:
+        index = build_interval_index(parse_ranges(ranges_part))
+        write_interval_index(path, digest, index)
+    return index
+
+
+# Intervalindex per worker-process, één keer gezet via de pool-initializer:
+# als lijsten (voor bisect) en, als het in int64 past, als numpy-arrays.
+_WORKER_INDEX = None
+_WORKER_ARRAYS = None
+
+
+def _init_classify_worker(index) -> None:
+    global _WORKER_INDEX, _WORKER_ARRAYS
+    _WORKER_INDEX = index
+    _WORKER_ARRAYS = None
+    if np is not None:
+        try:
+            _WORKER_ARRAYS = (
+                np.asarray(index[0], dtype=np.int64),
+                np.asarray(index[1], dtype=np.int64),
+            )
+        except OverflowError:
+            pass  # grenzen buiten int64: alleen bisect gebruiken
+
+
+def _classify_chunk(chunk: bytes) -> int:
+    """Tel de verse IDs in één blok bytes (alleen hele regels)."""
+    ids = [int(token) for token in chunk.split()]
+    if _WORKER_ARRAYS is not None:
+        try:
+            return count_fresh_ids_numpy(_WORKER_ARRAYS, np.asarray(ids, dtype=np.int64))
+        except OverflowError:
+            pass  # een ID buiten int64: dit blok via bisect
+    return count_fresh_ids_in_index(_WORKER_INDEX, ids)
+
+
+def _iter_id_chunks(f, chunk_bytes: int):
+    """Lees de rest van f in blokken van ~chunk_bytes, steeds afgekapt op een regeleinde."""
+    tail = b""
+    while True:
+        block = f.read(chunk_bytes)
+        if not block:
+            break
+        block = tail + block
+        cut = block.rfind(b"\n") + 1
+        tail = block[cut:]
+        if cut:
+            yield block[:cut]
+    if tail.strip():
+        yield tail
+
+
+def count_fresh_ids_streaming(
+    filename: str, index_path: str = INDEX_FILENAME, chunk_bytes: int = 1 << 23, workers=None
+) -> int:
+    """
+    Streamende variant van deel 1 voor ID-feeds van meerdere GB:
+      1. lees de ranges-sectie regel voor regel en open de intervalindex
+      2. lees de ID-sectie in blokken van vaste grootte (afgekapt op regeleinde)
+      3. laat een process pool elk blok tegen de gedeelde index classificeren
+    Er staan hooguit 2 * workers blokken tegelijk in het geheugen.
+    Met workers=1 draait alles in dit proces.
+    """
+    with open(filename, "rb") as f:
+        range_lines = []
+        for raw in f:
+            if not raw.strip():
+                break
+            range_lines.append(raw.decode("utf-8"))
+        else:
+            raise ValueError(
+                f"Invoerbestand '{filename}' heeft niet het verwachte formaat "
+                "(er moet één lege regel tussen ranges en IDs staan)."
+            )
+
+        index = open_interval_index(index_path, "".join(range_lines))
+        shared = (list(index[0]), list(index[1]))
+        chunks = _iter_id_chunks(f, chunk_bytes)
+
+        if workers == 1:
+            _init_classify_worker(shared)
+            return sum(map(_classify_chunk, chunks))
+
+        workers = workers or os.cpu_count() or 1
+        total = 0
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_classify_worker, initargs=(shared,)
+        ) as pool:
+            pending = set()
+            for chunk in chunks:
+                pending.add(pool.submit(_classify_chunk, chunk))
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    total += sum(fut.result() for fut in done)
+
+            total += sum(fut.result() for fut in pending)
+
+        return total
 
 
 def main():
@@ -42,23 +291,45 @@ def main():
     ranges_example = parse_ranges(ranges_part)
     example_result = count_fresh_ids(ranges_example, ids_part)
     print("Testresultaat (moet 3 zijn):", example_result)
+    index_example = build_interval_index(ranges_example)
+    if np is not None:
+        assert count_fresh_ids_numpy(index_example, parse_ids(ids_part)) == 3
+
+    # Index op schijf: na wegschrijven en mappen moet hetzelfde antwoord komen
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = os.path.join(tmp, "voorbeeld.idx")
+        open_interval_index(index_path, ranges_part)
+        loaded = open_interval_index(index_path, ranges_part)
+        assert (list(loaded[0]), list(loaded[1])) == index_example
+        assert count_fresh_ids_in_index(loaded, parse_ids(ids_part)) == 3
+        del loaded
+
+        # Zelfde ranges met CRLF: de index moet hergebruikt worden (niet herschreven)
+        inode = os.stat(index_path).st_ino
+        open_interval_index(index_path, ranges_part.replace("\n", "\r\n") + "\r\n")
+        assert os.stat(index_path).st_ino == inode, "Index onnodig herschreven"
+
+        # Streamend, met piepkleine blokken zodat IDs over blokgrenzen vallen
+        input_path = os.path.join(tmp, "voorbeeld.txt")
+        with open(input_path, "w", encoding="utf-8") as f:
+            f.write(example_input)
+        streamed = count_fresh_ids_streaming(input_path, index_path, chunk_bytes=3, workers=1)
+        assert streamed == 3, f"Streamende telling faalt: {streamed}"
+
+        # IDs en grenzen buiten int64 vallen terug op bisect
+        with open(input_path, "w", encoding="utf-8") as f:
+            f.write(f"1-5\n{2 ** 70}-{2 ** 70 + 2}\n\n3\n{2 ** 70 + 1}\n{2 ** 70 + 3}\n")
+        huge = count_fresh_ids_streaming(input_path, index_path, workers=1)
+        assert huge == 2, f"Streamende telling met grote getallen faalt: {huge}"
+        with open(input_path, "w", encoding="utf-8") as f:
+            f.write(f"1-5\n\n3\n{2 ** 70}\n")
+        huge = count_fresh_ids_streaming(input_path, index_path, workers=1)
+        assert huge == 1, f"Streamende telling met groot ID faalt: {huge}"
 
-    # 2. Nu de echte puzzelinput uit bestand
+    # 2. Nu de echte puzzelinput uit bestand: ranges eerst, daarna de IDs
+    #    in blokken (ranges worden alleen opnieuw samengevoegd als ze veranderd zijn)
     filename = "input_puzzel_dag5.txt"
-    with open(filename, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    # Splitsen op de eerste lege regel
-    parts = content.split("\n\n", 1)
-    if len(parts) != 2:
-        raise ValueError(
-            f"Invoerbestand '{filename}' heeft niet het verwachte formaat "
-            "(er moet één lege regel tussen ranges en IDs staan)."
-        )
-
-    ranges_part, ids_part = parts
-    ranges_puzzle = parse_ranges(ranges_part)
-    puzzle_result = count_fresh_ids(ranges_puzzle, ids_part)
+    puzzle_result = count_fresh_ids_streaming(filename)
 
     print("Aantal verse ingredient IDs in de puzzelinput:", puzzle_result)
 
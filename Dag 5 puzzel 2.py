@@ -1,3 +1,18 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
+
+# Binary index file for the merged ranges (see write_interval_index)
+INDEX_MAGIC = b"DAG5IDX1"
+INDEX_HEADER = "<8s32sQ"
+INDEX_FILENAME = "input_puzzel_dag5.idx"
+
+
 def parse_ranges(ranges_str: str):
     """Parse lines 'start-end' into a list of (start, end) integer tuples."""
     ranges = []
@@ -32,15 +47,180 @@ def merge_ranges(ranges):
     return merged
 
 
+class IntervalSet:
+    """
+    Dynamic set of disjoint, non-touching intervals for live range updates.
+    Intervals are kept sorted in two parallel lists (starts, ends), so every
+    lookup is a bisect. The number of covered IDs is updated on every insert
+    and delete, so count_total_ids on an IntervalSet is O(1).
+    """
+
+    def __init__(self, ranges=()):
+        self.starts = []
+        self.ends = []
+        self.total = 0
+        for start, end in ranges:
+            self.add(start, end)
+
+    def add(self, start, end):
+        """Insert [start, end], merging with every overlapping or touching interval."""
+        i = bisect_left(self.ends, start - 1)    # first interval ending at or after start - 1
+        j = bisect_right(self.starts, end + 1)   # intervals starting at or before end + 1
+
+        absorbed = 0
+        if i < j:
+            start = min(start, self.starts[i])
+            end = max(end, self.ends[j - 1])
+            absorbed = sum(self.ends[k] - self.starts[k] + 1 for k in range(i, j))
+
+        self.starts[i:j] = [start]
+        self.ends[i:j] = [end]
+        self.total += (end - start + 1) - absorbed
+
+    def remove(self, start, end):
+        """Delete all IDs in [start, end], splitting intervals that stick out."""
+        i = bisect_left(self.ends, start)    # first interval ending at or after start
+        j = bisect_right(self.starts, end)   # intervals starting at or before end
+        if i >= j:
+            return
+
+        removed = sum(self.ends[k] - self.starts[k] + 1 for k in range(i, j))
+        keep_starts = []
+        keep_ends = []
+
+        if self.starts[i] < start:
+            keep_starts.append(self.starts[i])
+            keep_ends.append(start - 1)
+        if self.ends[j - 1] > end:
+            keep_starts.append(end + 1)
+            keep_ends.append(self.ends[j - 1])
+
+        self.starts[i:j] = keep_starts
+        self.ends[i:j] = keep_ends
+        self.total -= removed - sum(e - s + 1 for s, e in zip(keep_starts, keep_ends))
+
+    def __contains__(self, x):
+        i = bisect_right(self.starts, x) - 1
+        return i >= 0 and x <= self.ends[i]
+
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+
 def count_total_ids(ranges):
     """Count how many unique IDs are represented by merged ranges."""
+    if isinstance(ranges, IntervalSet):
+        return ranges.total
+
     total = 0
     for start, end in ranges:
         total += (end - start + 1)
     return total
 
 
+def build_interval_index(ranges):
+    """Merge the ranges once and split them into sorted (starts, ends) lists."""
+    merged = merge_ranges(list(ranges))
+    return [start for start, _ in merged], [end for _, end in merged]
+
+
+def write_interval_index(path: str, digest: bytes, index) -> bool:
+    """
+    Write the merged intervals to a compact binary index file: a header
+    (magic, sha256 of the ranges section, count) followed by all starts and
+    then all ends as little-endian int64. Returns False if a value does not
+    fit in an int64.
+    """
+    starts, ends = index
+    try:
+        body = array("q", starts).tobytes() + array("q", ends).tobytes()
+    except OverflowError:
+        return False
+    if sys.byteorder != "little":
+        return False
+
+    # Write to a temporary file first and replace atomically: a process that
+    # still has the old index mapped keeps seeing a valid file.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(struct.pack(INDEX_HEADER, INDEX_MAGIC, digest, len(starts)))
+            f.write(body)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return True
+
+
+def load_interval_index(path: str, digest: bytes):
+    """
+    Memory-map an index file and return (starts, ends) as int64 views
+    (usable with bisect and numpy). None if the file is missing or does not
+    belong to this ranges section.
+    """
+    if not os.path.exists(path) or sys.byteorder != "little":
+        return None
+
+    header_size = struct.calcsize(INDEX_HEADER)
+    with open(path, "rb") as f:
+        header = f.read(header_size)
+        if len(header) < header_size:
+            return None
+        magic, stored_digest, n = struct.unpack(INDEX_HEADER, header)
+        if magic != INDEX_MAGIC or stored_digest != digest:
+            return None
+        if os.fstat(f.fileno()).st_size != header_size + 16 * n:
+            return None
+        if n == 0:
+            return [], []
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    values = memoryview(mm)[header_size:].cast("q")
+    return values[:n], values[n:]
+
+
+def open_interval_index(path: str, ranges_part: str):
+    """
+    Load the index from disk if the ranges section is unchanged; otherwise
+    parse and merge the ranges again and rewrite the index file.
+    """
+    # Hash the normalized lines (no \r, no blank lines) so parts 1 and 2 get the
+    # same digest, and thus share the index file, for the same ranges.
+    normalized = "\n".join(line.strip() for line in ranges_part.splitlines() if line.strip())
+    digest = hashlib.sha256(normalized.encode("utf-8")).digest()
+    index = load_interval_index(path, digest)
+    if index is None:
+        index = build_interval_index(parse_ranges(ranges_part))
+        write_interval_index(path, digest, index)
+    return index
+
+
+def test_interval_set():
+    """Check IntervalSet against the example ranges and a few edge cases."""
+    example_ranges = [(3, 5), (10, 14), (16, 20), (12, 18)]
+    s = IntervalSet(example_ranges)
+    assert list(s) == merge_ranges(list(example_ranges)) == [(3, 5), (10, 20)]
+    assert count_total_ids(s) == count_total_ids(merge_ranges(list(example_ranges))) == 14
+
+    # Touching intervals are merged into one
+    s.add(6, 9)
+    assert list(s) == [(3, 20)] and count_total_ids(s) == 18
+
+    # Removing from the middle splits one interval in two
+    s.remove(8, 12)
+    assert list(s) == [(3, 7), (13, 20)] and count_total_ids(s) == 13
+
+    # Membership at the interval edges
+    assert 3 in s and 7 in s and 13 in s and 20 in s
+    assert 2 not in s and 8 not in s and 12 not in s and 21 not in s
+
+    print("IntervalSet test passed")
+
+
 def main():
+    test_interval_set()
+
     filename = "input_puzzel_dag5.txt"
     with open(filename, "r", encoding="utf-8") as f:
         content = f.read()
@@ -49,9 +229,9 @@ def main():
     parts = content.split("\n\n", 1)
     ranges_part = parts[0]
 
-    ranges = parse_ranges(ranges_part)
-    merged = merge_ranges(ranges)
-    total_ids = count_total_ids(merged)
+    # Only re-parse and re-merge when the ranges section has changed
+    starts, ends = open_interval_index(INDEX_FILENAME, ranges_part)
+    total_ids = count_total_ids(zip(starts, ends))
 
     print("Totaal aantal ingredient IDs dat vers is volgens de ranges:", total_ids)
 
@@ -1,5 +1,21 @@
 # dag6_cephalopod_math.py
 
+import mmap
+import os
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optioneel; zonder numpy gebruiken we alleen de scalaire parser
+    np = None
+
+# Meer cijfers per getal passen niet gegarandeerd in een int64
+MAX_INT64_DIGITS = 18
+POW10 = np.array([10 ** e for e in range(MAX_INT64_DIGITS + 1)], dtype=np.int64) if np else None
+
 TEST_INPUT = """123 328  51  64
  45  64 387  23
   6  98 215 314
@@ -72,40 +88,266 @@ def parse_worksheet(lines):
     return problems
 
 
-def eval_problems(problems):
+def worksheet_array(lines):
+    """Zet de regels om naar een 2D uint8-array, rechts aangevuld met spaties. Vereist numpy."""
+    rows = [line.rstrip("\n").encode("ascii") for line in lines]
+    width = max(len(row) for row in rows)
+    grid = np.full((len(rows), width), ord(" "), dtype=np.uint8)
+    for r, row in enumerate(rows):
+        grid[r, : len(row)] = np.frombuffer(row, dtype=np.uint8)
+    return grid
+
+
+def _segments(grid):
+    """Begin- en eindkolommen van alle blokken content-kolommen, via één reductie over de rijen."""
+    content = (grid != ord(" ")).any(axis=0).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], content, [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1) - 1
+    return starts, ends
+
+
+def _segment_ops(bottom, starts):
+    """Per segment: aantal operators en de laagste/hoogste operatorcode op de onderste regel."""
+    is_op = (bottom == ord("+")) | (bottom == ord("*"))
+    count = np.add.reduceat(is_op.astype(np.int64), starts)
+    lo = np.minimum.reduceat(np.where(is_op, bottom, 255), starts)
+    hi = np.maximum.reduceat(np.where(is_op, bottom, 0), starts)
+    return count, lo, hi
+
+
+def parse_worksheet_numpy(lines):
     """
-    Bereken de grand total: voor elk probleem eerst de som of het product
-    van zijn getallen, daarna alle uitkomsten bij elkaar optellen.
+    Gevectoriseerde variant van parse_worksheet (zelfde uitvoer).
+    Het werkblad wordt een uint8-array; scheidingskolommen, operators en de
+    getallen per rij en per segment komen uit array-reducties. Elk cijfer krijgt
+    als gewicht 10 ** (aantal cijfers rechts ervan binnen hetzelfde segment).
     """
-    grand_total = 0
-    for op, nums in problems:
-        if not nums:
+    grid = worksheet_array(lines)
+    starts, ends = _segments(grid)
+    if len(starts) == 0:
+        return []
+
+    op_count, _, op_code = _segment_ops(grid[-1], starts)
+
+    digits = grid[:-1]
+    is_digit = (digits >= ord("0")) & (digits <= ord("9"))
+
+    per_segment = np.add.reduceat(is_digit.astype(np.int64), starts, axis=1)
+    if per_segment.size and per_segment.max() > MAX_INT64_DIGITS:
+        return parse_worksheet(lines)  # getallen passen niet in int64
+
+    # Aantal cijfers vanaf kolom c tot het einde van de rij ...
+    suffix = np.cumsum(is_digit[:, ::-1], axis=1)[:, ::-1]
+    suffix = np.concatenate((suffix, np.zeros((len(digits), 1), dtype=suffix.dtype)), axis=1)
+    # ... min het aantal na het einde van het eigen segment
+    seg_of_col = np.maximum(np.searchsorted(starts, np.arange(grid.shape[1]), side="right") - 1, 0)
+    after_segment = suffix[:, ends[seg_of_col] + 1]
+    exponent = np.where(is_digit, suffix[:, :-1] - after_segment - 1, 0)
+
+    weighted = np.where(is_digit, (digits - ord("0")).astype(np.int64) * POW10[exponent], 0)
+    values = np.add.reduceat(weighted, starts, axis=1)
+
+    problems = []
+    for count, code, row_values, row_counts in zip(
+        op_count.tolist(), op_code.tolist(), values.T.tolist(), per_segment.T.tolist()
+    ):
+        if count == 0:
             continue
-        if op == "+":
-            value = sum(nums)
-        elif op == "*":
+        if count > 1:
+            raise ValueError("Meer dan één operator in een probleemsegment.")
+        nums = [v for v, n in zip(row_values, row_counts) if n]
+        problems.append((chr(code), nums))
+
+    return problems
+
+
+def _row_spans(mm):
+    """(offset, lengte) van elke regel in het gemapte bestand, zonder regeleinde."""
+    spans = []
+    pos = 0
+    size = len(mm)
+    while pos < size:
+        nl = mm.find(b"\n", pos)
+        if nl == -1:
+            nl = size
+        length = nl - pos
+        if length and mm[nl - 1 : nl] == b"\r":
+            length -= 1
+        spans.append((pos, length))
+        pos = nl + 1
+    return spans
+
+
+def _last_blank_column(rows):
+    """Index van de laatste kolom die in alle (even lange) rijen een spatie is, of None."""
+    if np is not None:
+        grid = np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(len(rows), -1)
+        blank = np.flatnonzero((grid == ord(" ")).all(axis=0))
+        return int(blank[-1]) if len(blank) else None
+
+    for c in range(len(rows[0]) - 1, -1, -1):
+        if all(row[c] == ord(" ") for row in rows):
+            return c
+    return None
+
+
+def iter_problems_mmap(filename, window=1 << 20):
+    """
+    Streamende variant voor zeer brede werkbladen: memory-map het bestand en
+    lees alle rijen tegelijk in kolomvensters van window kolommen (één
+    file-offset per rij). Elk venster wordt afgekapt op de laatste lege kolom;
+    de volledige problemen daarvoor worden geparsed en één voor één opgeleverd,
+    de rest schuift door naar het volgende venster. Is één probleem breder dan
+    het venster, dan wordt het venster vergroot. Het geheugengebruik wordt zo
+    begrensd door het breedste enkele probleem.
+    """
+    parse = parse_worksheet_numpy if np is not None else parse_worksheet
+
+    with open(filename, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # een leeg bestand kan niet gemapt worden
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            rows = _row_spans(mm)
+            width = max(length for _, length in rows)
+
+            col = 0
+            size = window
+            while col < width:
+                end = min(col + size, width)
+                chunk = [
+                    mm[off + min(col, length) : off + min(end, length)].ljust(end - col)
+                    for off, length in rows
+                ]
+
+                if end < width:
+                    cut = _last_blank_column(chunk)
+                    if cut is None:
+                        size *= 2
+                        continue
+                    chunk = [row[:cut] for row in chunk]
+                    next_col = col + cut + 1
+                else:
+                    next_col = end
+
+                yield from parse([row.decode("ascii") for row in chunk])
+                col = next_col
+                size = window
+
+
+def product_tree(nums):
+    """
+    Product via een gebalanceerde boom: eerst paren vermenigvuldigen, dan paren
+    van paren, enzovoort. Zo zijn de factoren steeds ongeveer even groot, wat bij
+    getallen van duizenden cijfers veel sneller is dan links-naar-rechts.
+    """
+    values = list(nums)
+    if not values:
+        return 1
+    while len(values) > 1:
+        paired = [values[i] * values[i + 1] for i in range(0, len(values) - 1, 2)]
+        if len(values) % 2:
+            paired.append(values[-1])
+        values = paired
+    return values[0]
+
+
+def eval_problem(problem, modulus=None):
+    """
+    Uitkomst van één probleem (op, nums). Met modulus wordt alles modulo die
+    waarde gerekend, zodat er nooit grote getallen ontstaan.
+    """
+    op, nums = problem
+    if not nums:
+        return 0
+
+    if op == "+":
+        value = sum(nums)
+    elif op == "*":
+        if modulus is None:
+            value = product_tree(nums)
+        else:
             value = 1
             for x in nums:
-                value *= x
-        else:
-            raise ValueError(f"Onbekende operator: {op!r}")
+                value = value * x % modulus
+    else:
+        raise ValueError(f"Onbekende operator: {op!r}")
 
-        grand_total += value
+    return value if modulus is None else value % modulus
 
-    return grand_total
+
+# Aantal problemen per taak voor de process pool in eval_problems
+EVAL_BATCH_SIZE = 64
+
+
+def _eval_batch(batch, modulus=None) -> int:
+    """Som van de uitkomsten van één batch problemen (uitgevoerd in een worker)."""
+    return sum(eval_problem(problem, modulus=modulus) for problem in batch)
+
+
+def eval_problems(problems, modulus=None, workers=1):
+    """
+    Bereken de grand total: voor elk probleem eerst de som of het product
+    van zijn getallen, daarna alle uitkomsten bij elkaar optellen.
+    Opties:
+    - modulus: geef de grand total modulo deze waarde terug.
+    - workers: aantal processen; 1 rekent in dit proces, None gebruikt alle cores.
+      Problemen gaan in batches naar de pool, met hooguit 2 * workers batches
+      tegelijk onderweg, zodat een streamende bron niet in één keer wordt ingelezen.
+    """
+    evaluate = partial(eval_problem, modulus=modulus)
+
+    if workers == 1:
+        grand_total = sum(map(evaluate, problems))
+    else:
+        workers = workers or os.cpu_count() or 1
+        problems = iter(problems)
+        grand_total = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            while batch := list(islice(problems, EVAL_BATCH_SIZE)):
+                pending.add(pool.submit(_eval_batch, batch, modulus))
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    grand_total += sum(fut.result() for fut in done)
+
+            grand_total += sum(fut.result() for fut in pending)
+
+    return grand_total if modulus is None else grand_total % modulus
 
 
 def solve(lines):
-    problems = parse_worksheet(lines)
+    if np is not None:
+        problems = parse_worksheet_numpy(lines)
+    else:
+        problems = parse_worksheet(lines)
     return eval_problems(problems)
 
 
 def run_test():
     test_lines = TEST_INPUT.splitlines()
+    if np is not None:
+        assert parse_worksheet_numpy(test_lines) == parse_worksheet(test_lines)
     result = solve(test_lines)
     assert (
         result == EXPECTED_TEST_TOTAL
     ), f"Test faalt: verwacht {EXPECTED_TEST_TOTAL}, kreeg {result}"
+
+    # Producten via de boom en de modulaire modus
+    assert product_tree([2, 3, 5, 7, 11]) == 2310
+    problems = parse_worksheet(test_lines)
+    assert eval_problems(problems, modulus=1000) == EXPECTED_TEST_TOTAL % 1000
+
+    # Streamend over een tijdelijk bestand, met een venster van een paar kolommen
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "voorbeeld.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(TEST_INPUT + "\n")
+        streamed = eval_problems(iter_problems_mmap(path, window=3))
+        pooled = eval_problems(iter_problems_mmap(path, window=3), workers=2)
+    assert streamed == EXPECTED_TEST_TOTAL, f"Streamende test faalt: kreeg {streamed}"
+    assert pooled == EXPECTED_TEST_TOTAL, f"Test met process pool faalt: kreeg {pooled}"
     print(f"Test geslaagd, grand total = {result}")
 
 
@@ -113,11 +355,8 @@ def main():
     # 1. Test eerst met de voorbeeldinput
     run_test()
 
-    # 2. Lees daarna de echte puzzelinput
-    with open("input_puzzel_dag6.txt", encoding="utf-8") as f:
-        lines = f.read().splitlines()
-
-    total = solve(lines)
+    # 2. Reken daarna de echte puzzelinput streamend door
+    total = eval_problems(iter_problems_mmap("input_puzzel_dag6.txt"))
     print(f"Uitkomst voor input_puzzel_dag6.txt: {total}")
 
 
@@ -63,6 +63,58 @@ def count_splits(grid):
     return splits
 
 
+# '^' wordt een 1-bit; lege ruimte, 'S' en de cijfers '0'/'1' een 0-bit
+SPLITTER_BITS = str.maketrans("^.S01", "10000")
+
+
+def splitter_mask(row: str) -> int:
+    """Bitmasker van de splitters '^' in één rij (bit c = kolom c)."""
+    bits = row[::-1].translate(SPLITTER_BITS)
+    if bits.strip("01"):
+        # Andere tekens behandelen we (net als count_splits) als lege ruimte
+        bits = "".join("1" if ch == "^" else "0" for ch in reversed(row))
+    return int(bits or "0", 2)
+
+
+def count_splits_bitset(grid):
+    """
+    Zelfde uitkomst als count_splits, maar met één Python-int als bitset per rij:
+    de actieve bundels zijn ook één int. Per rij:
+      hits   = bundels & splitters
+      splits += aantal bits in hits
+      bundels = (bundels & ~splitters) | (hits << 1) | (hits >> 1), binnen de breedte
+    """
+    height = len(grid)
+    if height == 0:
+        return 0
+    width = len(grid[0])
+    full = (1 << width) - 1
+
+    start_row = None
+    for r, row in enumerate(grid):
+        c = row.find('S')
+        if c != -1:
+            start_row = r
+            beams = 1 << c
+            break
+
+    if start_row is None:
+        raise ValueError("Geen 'S' gevonden in het rooster.")
+
+    # Alle splittermaskers één keer vooraf opbouwen
+    masks = [splitter_mask(row) for row in grid[start_row + 1 :]]
+
+    splits = 0
+    for splitters in masks:
+        if not beams:
+            break
+        hits = beams & splitters
+        splits += hits.bit_count()
+        beams = ((beams & ~splitters) | (hits << 1) | (hits >> 1)) & full
+
+    return splits
+
+
 def run_test_example():
     """Controleer dat het voorbeeld uit de opgave 21 splits geeft."""
     example_str = """\
@@ -90,6 +142,19 @@ def run_test_example():
         raise AssertionError(
             f"Test faalde: verwacht {expected} splits, maar kreeg {result}."
         )
+    result_bitset = count_splits_bitset(example_grid)
+    if result_bitset != expected:
+        raise AssertionError(
+            f"Test (bitset) faalde: verwacht {expected} splits, maar kreeg {result_bitset}."
+        )
+
+    # Onbekende tekens (ook '1', '_' en spaties) zijn lege ruimte
+    for odd_grid in (
+        ["..S..", "..1..", ".^.^."],
+        ["..S..", "..^..", ".^_^."],
+        ["..S..", ".^.. ", " ^.^."],
+    ):
+        assert count_splits_bitset(odd_grid) == count_splits(odd_grid), odd_grid
     print(f"Test geslaagd: voorbeeld geeft {result} splits.")
 
 
@@ -97,7 +162,7 @@ def run_puzzle_input(filename: str = "input_puzzel_dag7.txt"):
     """Lees de echte puzzelinput uit bestand en print het aantal splits."""
     with open(filename, "r", encoding="utf-8") as f:
         grid = [line.rstrip("\n") for line in f if line.strip() != ""]
-    result = count_splits(grid)
+    result = count_splits_bitset(grid)
     print(f"Aantal splits in {filename}: {result}")
 
 
@@ -1,3 +1,18 @@
+try:
+    import numpy as np
+except ImportError:  # numpy is optioneel; zonder numpy gebruiken we alleen de lijstversie
+    np = None
+
+# Grootste modulus voor de int64-modus: per cel komen er hooguit drie
+# waarden < modulus bij elkaar, en dat moet in een int64 passen.
+MAX_TIMELINE_MODULUS = 2 ** 61
+
+# In de exacte modus rekenen we in int64 zolang alle waarden onder deze grens
+# blijven (ook dan past een cel met drie bijdragen nog in een int64); daarboven
+# gaat de rest van het rooster via de lijstversie met Python-ints.
+EXACT_INT64_LIMIT = 2 ** 61
+
+
 def parse_grid_from_string(s: str):
     """Neemt een multiline string en geeft een lijst van rijen terug."""
     lines = [line.rstrip("\n") for line in s.splitlines() if line.strip() != ""]
@@ -83,11 +98,19 @@ def count_timelines(grid):
         raise ValueError("Geen 'S' gevonden in het rooster.")
 
     # current[c] = aantal tijdlijnen op huidige rij 'row' op kolom c
-    row = start_row
     current = [0] * width
     current[start_col] = 1
 
-    finished = 0  # tijdlijnen die het manifold al hebben verlaten
+    return _timelines_from_row(grid, start_row, current, 0)
+
+
+def _timelines_from_row(grid, row, current, finished):
+    """
+    Loop van count_timelines vanaf rij 'row' met tijdlijnen 'current' (lijst)
+    en 'finished' tijdlijnen die het manifold al verlaten hebben.
+    """
+    height = len(grid)
+    width = len(current)
 
     # Zolang we niet voorbij de laatste rij zijn
     while row < height - 1 and any(current):
@@ -127,6 +150,76 @@ def count_timelines(grid):
     return finished
 
 
+def count_timelines_numpy(grid, modulus=None):
+    """
+    Gevectoriseerde variant van count_timelines: 'current' is een numpy-array
+    en per rij is er een boolean masker van de splitters. Eén rij is dan:
+    wat op een splitter valt (hits) gaat één kolom naar links en één naar
+    rechts, de rest gaat recht naar beneden.
+
+    Tijdlijnen groeien exponentieel, dus:
+    - modulus=None: exact; int64 zolang de waarden onder EXACT_INT64_LIMIT
+                    blijven, daarna verder met de lijstversie (Python-ints)
+    - modulus=m:    int64 en alles modulo m (m <= MAX_TIMELINE_MODULUS)
+    """
+    height = len(grid)
+    if height == 0:
+        return 0
+    width = len(grid[0])
+
+    # Zoek 'S'
+    start_row = None
+    start_col = None
+    for r, row in enumerate(grid):
+        c = row.find('S')
+        if c != -1:
+            start_row = r
+            start_col = c
+            break
+
+    if start_row is None:
+        raise ValueError("Geen 'S' gevonden in het rooster.")
+
+    if modulus is not None and not 0 < modulus <= MAX_TIMELINE_MODULUS:
+        raise ValueError(f"Modulus moet tussen 1 en {MAX_TIMELINE_MODULUS} liggen, kreeg {modulus}.")
+
+    cells = np.frombuffer("".join(grid).encode("ascii"), dtype=np.uint8).reshape(height, width)
+    splitters = cells == ord('^')
+
+    current = np.zeros(width, dtype=np.int64)
+    current[start_col] = 1
+
+    finished = 0  # tijdlijnen die het manifold al hebben verlaten
+
+    for nr in range(start_row + 1, height):
+        if not current.any():
+            break
+
+        if modulus is None and current.max() >= EXACT_INT64_LIMIT:
+            # Bijna te groot voor int64: de rest met Python-ints (een object-array
+            # zou per element rekenen en is trager dan de lijstversie)
+            return _timelines_from_row(grid, nr - 1, current.tolist(), finished)
+
+        hits = current * splitters[nr]
+        new = current - hits
+
+        # Splitst naar links en naar rechts
+        new[:-1] += hits[1:]
+        new[1:] += hits[:-1]
+        # Wat links of rechts buiten het rooster valt, eindigt
+        finished += int(hits[0]) + int(hits[-1])
+
+        if modulus is not None:
+            new %= modulus
+            finished %= modulus
+        current = new
+
+    # Alles wat nog in 'current' zit, valt nu onder het rooster uit
+    finished += sum(current.tolist())
+
+    return finished if modulus is None else finished % modulus
+
+
 def run_test_example():
     """Controleer dat het voorbeeld uit de opgave 21 splits en 40 tijdlijnen geeft."""
     example_str = """\
@@ -165,6 +258,18 @@ def run_test_example():
         raise AssertionError(
             f"Test deel 2 faalde: verwacht {expected_part2}, kreeg {result_part2}."
         )
+    if np is not None:
+        result_numpy = count_timelines_numpy(example_grid)
+        if result_numpy != expected_part2:
+            raise AssertionError(
+                f"Test deel 2 (numpy) faalde: verwacht {expected_part2}, kreeg {result_numpy}."
+            )
+        if count_timelines_numpy(example_grid, modulus=7) != expected_part2 % 7:
+            raise AssertionError("Test deel 2 (numpy, modulair) faalde.")
+        # Diep rooster: tijdlijnen groeien voorbij int64, de uitkomst blijft exact
+        deep_grid = ["." * 40 + "S" + "." * 40] + [".^" * 40 + ".", "^." * 40 + "^"] * 40
+        if count_timelines_numpy(deep_grid) != count_timelines(deep_grid):
+            raise AssertionError("Test deel 2 (numpy, voorbij int64) faalde.")
     print(f"Test deel 2 geslaagd: voorbeeld geeft {result_part2} tijdlijnen.")
 
 
@@ -174,7 +279,10 @@ def run_puzzle_input(filename: str = "input_puzzel_dag7.txt"):
         grid = [line.rstrip("\n") for line in f if line.strip() != ""]
 
     part1 = count_splits(grid)
-    part2 = count_timelines(grid)
+    if np is not None:
+        part2 = count_timelines_numpy(grid)
+    else:
+        part2 = count_timelines(grid)
 
     print(f"Aantal splits (deel 1) in {filename}: {part1}")
     print(f"Aantal tijdlijnen (deel 2) in {filename}: {part2}")